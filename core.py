@@ -1,43 +1,43 @@
 # core.py
 """
 Core functionality for INS inventory app:
-- DB + migrations
+- DB connection manager + migrations
 - CRUD for inventory and other forms
 - Transactions logging
-- PDF & barcode generation
-- Backup and printing helpers
+- Bulk CSV/Excel import, streaming CSV and Parquet/Arrow export
+- PDF, barcode and ZPL/EPL label generation, printing (lazy submodules core_pdf/core_barcode/core_zpl/core_print)
+- Cache of generated PDFs (core_cache)
+- Backup helpers
 
 This file is UI-agnostic so it can be imported by `main_ui.py`.
-It also supports a small CLI: `python core.py migrate`.
+It also supports a small CLI: `python core.py migrate|explain|import|export|labels|bench-labels|pdf-cache|startup-profile ...` (see --help).
 """
 
-import os, sqlite3, tempfile, datetime, shutil, subprocess, sys
+import os, re, sqlite3, tempfile, datetime, shutil, subprocess, sys, threading, time, itertools, math, weakref
+from contextlib import contextmanager
 from uuid import uuid4
 
-# third-party libs used here (ensure installed in your venv)
-from reportlab.pdfgen import canvas
-from reportlab.graphics.barcode import code128
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from barcode import Code128
-from barcode.writer import ImageWriter
-from PIL import Image  # used indirectly by python-barcode ImageWriter
-
 # Paths & constants (change if you want)
 DB_PATH = r"C:\ProgramData\MyWarehouse\forms.db"
 BACKUP_DIR = r"C:\ProgramData\MyWarehouse\backups"
 TMP = tempfile.gettempdir()
 SUMATRA_PATH = r"C:\Program Files\SumatraPDF\SumatraPDF.exe"
+# thermal label printer for raw ZPL/EPL output: "tcp://host:9100", "printer:NAME" or a port/file
+LABEL_PRINTER = ""
+# generated PDFs, reused while the record/template is unchanged (core_cache)
+PDF_CACHE_DIR = os.path.join(TMP, "ins_pdf_cache")
+PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
 # ---------------------------
 # DATABASE & MIGRATION
 # ---------------------------
-def ensure_db_and_migrate():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute("PRAGMA journal_mode=WAL;")
-    # create core tables
+# Schema changes are numbered migrations applied in order. The number of the
+# last applied migration is stored in PRAGMA user_version, so a current
+# database is recognised with a single pragma read. Append new migrations to
+# MIGRATIONS; never edit or reorder ones that have shipped.
+
+def _m001_base_schema(cur):
+    # create core tables (IF NOT EXISTS: pre-versioning databases already have them)
     cur.execute("""
     CREATE TABLE IF NOT EXISTS inventory (
         id TEXT PRIMARY KEY,
@@ -114,9 +114,8 @@ def ensure_db_and_migrate():
         remarks TEXT,
         created_utc TEXT
     );""")
-    conn.commit()
 
-    # Ensure expected columns exist in inventory (best-effort non-destructive migration)
+    # Ensure expected columns exist in inventory (older databases predate some of them)
     expected_cols = {
         "s_no":"TEXT","sl_no_contract":"TEXT","set_patt_no":"TEXT","part_no":"TEXT","description":"TEXT",
         "denomination":"TEXT","type":"TEXT","qty_per_gt":"INTEGER","mdnd_def":"TEXT","lf_no":"TEXT","location_bin":"TEXT",
@@ -127,26 +126,312 @@ def ensure_db_and_migrate():
     present = {r[1] for r in cur.fetchall()}
     for col, col_type in expected_cols.items():
         if col not in present:
-            try:
-                cur.execute(f"ALTER TABLE inventory ADD COLUMN {col} {col_type};")
-            except Exception:
-                # ignore failures and continue
-                pass
-    conn.commit()
-    conn.close()
+            cur.execute(f"ALTER TABLE inventory ADD COLUMN {col} {col_type};")
+
+def _m002_lookup_indexes(cur):
+    # part_no lookups (scanner, UPDATE ... WHERE part_no = ?) and the
+    # ORDER BY created_utc DESC listings; without these every call is a full scan
+    for sql in (
+        "CREATE INDEX IF NOT EXISTS idx_inventory_part_no ON inventory(part_no)",
+        "CREATE INDEX IF NOT EXISTS idx_inventory_created_utc ON inventory(created_utc)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_part_no_created ON transactions(part_no, created_utc)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_created_utc ON transactions(created_utc)",
+        "CREATE INDEX IF NOT EXISTS idx_certified_receipt_part_no ON certified_receipt(part_no)",
+        "CREATE INDEX IF NOT EXISTS idx_certified_receipt_created_utc ON certified_receipt(created_utc)",
+        "CREATE INDEX IF NOT EXISTS idx_spares_issue_part_no ON spares_issue(part_no)",
+        "CREATE INDEX IF NOT EXISTS idx_spares_issue_created_utc ON spares_issue(created_utc)",
+        # demand_supply has no part_no column; patt_no is its pattern/part number
+        "CREATE INDEX IF NOT EXISTS idx_demand_supply_patt_no ON demand_supply(patt_no)",
+        "CREATE INDEX IF NOT EXISTS idx_demand_supply_created_utc ON demand_supply(created_utc)",
+    ):
+        cur.execute(sql)
+
+# columns covered by inventory search, with their bm25 weights (part numbers rank highest)
+FTS_COLUMNS = [("part_no", 10.0), ("description", 2.0), ("s_no", 5.0),
+               ("location_bin", 1.0), ("remarks", 1.0), ("denomination", 1.0)]
+
+def _m003_inventory_fts(cur):
+    # External-content FTS5 index over inventory, keyed on inventory's rowid and
+    # kept in sync by triggers. VACUUM may renumber rowids of a table without an
+    # INTEGER PRIMARY KEY; run rebuild_search_index() after one.
+    cols = ", ".join(c for c, _w in FTS_COLUMNS)
+    new_vals = ", ".join(f"new.{c}" for c, _w in FTS_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c, _w in FTS_COLUMNS)
+    weights = ", ".join(str(w) for _c, w in FTS_COLUMNS)
+    cur.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS inventory_fts USING fts5({cols}, "
+                "content='inventory', content_rowid='rowid', prefix='2 3')")
+    cur.execute(f"""CREATE TRIGGER IF NOT EXISTS inventory_fts_ai AFTER INSERT ON inventory BEGIN
+        INSERT INTO inventory_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+    END""")
+    cur.execute(f"""CREATE TRIGGER IF NOT EXISTS inventory_fts_ad AFTER DELETE ON inventory BEGIN
+        INSERT INTO inventory_fts(inventory_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+    END""")
+    # only fire for searchable columns, so qty adjustments never touch the index
+    cur.execute(f"""CREATE TRIGGER IF NOT EXISTS inventory_fts_au AFTER UPDATE OF {cols} ON inventory BEGIN
+        INSERT INTO inventory_fts(inventory_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+        INSERT INTO inventory_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+    END""")
+    cur.execute(f"INSERT INTO inventory_fts(inventory_fts, rank) VALUES ('rank', 'bm25({weights})')")
+    cur.execute("INSERT INTO inventory_fts(inventory_fts) VALUES ('rebuild')")
+
+PAGED_TABLES = ("inventory", "transactions", "certified_receipt", "spares_issue", "demand_supply")
+
+def _m004_keyset_indexes(cur):
+    # (created_utc, id) is the keyset used by list_page(); the composite index
+    # also serves plain ORDER BY created_utc, so the single-column ones go.
+    for t in PAGED_TABLES:
+        # NULL never compares < anything, which would hide those rows from paging
+        cur.execute(f"UPDATE {t} SET created_utc = '' WHERE created_utc IS NULL")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{t}_created_id ON {t}(created_utc, id)")
+        cur.execute(f"DROP INDEX IF EXISTS idx_{t}_created_utc")
+
+def _m005_inventory_modified_index(cur):
+    # lets PartIndex pick up rows changed by other processes without a full reload
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_inventory_modified_utc ON inventory(modified_utc)")
+
+def _m006_report_group_index(cur):
+    # grouped inventory report: rows come out in (location_bin, type, part_no)
+    # order straight from the index, and the subtotal GROUP BYs use it too
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_inventory_bin_type_part ON inventory(location_bin, type, part_no)")
+
+MIGRATIONS = [
+    (1, "base schema: inventory, transactions and voucher tables", _m001_base_schema),
+    (2, "indexes on part_no and created_utc lookup/sort columns", _m002_lookup_indexes),
+    (3, "FTS5 search index over inventory", _m003_inventory_fts),
+    (4, "(created_utc, id) keyset indexes for paginated listings", _m004_keyset_indexes),
+    (5, "inventory(modified_utc) index for part index refresh", _m005_inventory_modified_index),
+    (6, "inventory(location_bin, type, part_no) index for grouped reports", _m006_report_group_index),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+def migrate(conn, to=None):
+    """
+    Apply pending migrations up to `to` (default: latest) in one transaction.
+    `conn` must be in autocommit mode (isolation_level=None). Returns the list
+    of migration numbers applied.
+    """
+    target = SCHEMA_VERSION if to is None else int(to)
+    if target > SCHEMA_VERSION:
+        raise ValueError(f"Unknown schema version {target} (latest is {SCHEMA_VERSION})")
+    current = schema_version(conn)
+    if current > target:
+        raise ValueError(f"Database is at version {current}; downgrades are not supported")
+    if current == target:
+        return []
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # re-read under the write lock: another process may have migrated meanwhile
+        current = schema_version(conn)
+        if current > target:
+            raise ValueError(f"Database is at version {current}; downgrades are not supported")
+        cur = conn.cursor()
+        applied = []
+        for num, _desc, fn in MIGRATIONS:
+            if current < num <= target:
+                fn(cur)
+                applied.append(num)
+        cur.execute(f"PRAGMA user_version = {target};")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return applied
+
+def _open_raw(db_path=None):
+    db_path = db_path or DB_PATH
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return sqlite3.connect(db_path, timeout=30, isolation_level=None)
+
+def ensure_db_and_migrate(conn=None):
+    """
+    Bring the schema up to SCHEMA_VERSION. Without `conn` this goes through the
+    shared connection manager, whose setup hook runs the check once per process.
+    """
+    if conn is None:
+        get_db().connection()
+        return
+    migrate(conn)
+
+# ---------------------------
+# CONNECTION MANAGER
+# ---------------------------
+class _ThreadConnection:
+    # Held only by the owning thread's threading.local: when the thread ends
+    # and its locals are freed, the finalizer closes the connection.
+    __slots__ = ("finalizer", "__weakref__")
+
+class ConnectionManager:
+    """
+    Long-lived SQLite connections for one database file, one per thread.
+    Connections stay open for the life of the thread so sqlite3's prepared
+    statement cache is reused across calls, and are closed when the thread
+    exits (or on release()). `setup(conn)` runs once per manager, on the
+    first connection opened.
+    """
+
+    def __init__(self, db_path, setup=None, cached_statements=256):
+        self.db_path = db_path
+        self.setup = setup
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ready = False
+        self._conns = []
+
+    def _open(self):
+        d = os.path.dirname(self.db_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # isolation_level=None: autocommit unless inside transaction()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                               check_same_thread=False, cached_statements=self.cached_statements)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        with self._lock:
+            if not self._ready:
+                if self.setup is not None:
+                    self.setup(conn)
+                self._ready = True
+            self._conns.append(conn)
+        return conn
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            self._local.depth = 0
+            self._local.on_commit = []
+            owner = self._local.owner = _ThreadConnection()
+            owner.finalizer = weakref.finalize(owner, self._discard, conn)
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def release(self):
+        """Close the calling thread's connection now; the next call on this thread opens a new one."""
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            return
+        if self.in_transaction():
+            raise RuntimeError("release() inside a transaction")
+        del self._local.conn, self._local.depth, self._local.on_commit, self._local.owner
+        owner.finalizer()
+
+    def in_transaction(self):
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several statements into one BEGIN IMMEDIATE ... COMMIT. Nests:
+        an inner block is a SAVEPOINT, so if it fails it is rolled back on its
+        own (with its after_commit callbacks) even when the caller catches the
+        error and the outer transaction goes on to commit.
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        savepoint = f"sp_{depth}"
+        conn.execute(f"SAVEPOINT {savepoint}" if depth else "BEGIN IMMEDIATE")
+        queued = len(self._local.on_commit)
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            del self._local.on_commit[queued:]
+            if depth:
+                conn.execute(f"ROLLBACK TO {savepoint}"); conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.execute("ROLLBACK")
+            raise
+        self._local.depth -= 1
+        if depth:
+            conn.execute(f"RELEASE {savepoint}")
+            return
+        conn.execute("COMMIT")
+        callbacks, self._local.on_commit = self._local.on_commit, []
+        for fn in callbacks:
+            fn()
+
+    def after_commit(self, fn):
+        """Run fn once the current transaction commits (now, if there is none); dropped on rollback."""
+        if self.in_transaction():
+            self._local.on_commit.append(fn)
+        else:
+            fn()
+
+    def run(self, sql, params=(), fetch=False):
+        cur = self.connection().execute(sql, params)
+        return cur.fetchall() if fetch else None
+
+    def run_many(self, sql, seq_of_params):
+        with self.transaction() as conn:
+            conn.executemany(sql, seq_of_params)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._conns:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._conns = []
+            self._ready = False
+        self._local = threading.local()
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+def get_db(db_path=None, setup=None):
+    """Return the shared ConnectionManager for db_path (default: DB_PATH)."""
+    db_path = db_path or DB_PATH
+    with _managers_lock:
+        mgr = _managers.get(db_path)
+        if mgr is None:
+            if setup is None and db_path == DB_PATH:
+                setup = ensure_db_and_migrate
+            mgr = _managers[db_path] = ConnectionManager(db_path, setup=setup)
+        return mgr
+
+def transaction():
+    """`with core.transaction(): ...` runs every core call inside one commit."""
+    return get_db().transaction()
+
+def close_connections():
+    with _managers_lock:
+        for mgr in _managers.values():
+            mgr.close_all()
+        _managers.clear()
 
 # low-level helper
 def _run(sql, params=(), fetch=False):
-    ensure_db_and_migrate()
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute(sql, params)
-    rows = None
-    if fetch:
-        rows = cur.fetchall()
-    conn.commit()
-    conn.close()
-    return rows
+    return get_db().run(sql, params, fetch)
+
+# column order of each table, as returned by the list_* / get_* functions
+TABLE_COLUMNS = {
+    "inventory": ["id", "s_no", "sl_no_contract", "set_patt_no", "part_no", "description", "denomination", "type",
+                  "qty_per_gt", "mdnd_def", "lf_no", "location_bin", "received_from_whom", "qty_received",
+                  "issued_to_whom", "qty_issued", "total_qty", "balance", "remarks", "created_utc", "modified_utc"],
+    "transactions": ["id", "part_no", "delta", "tx_type", "reason", "source", "created_utc"],
+    "certified_receipt": ["id", "set_no", "part_no", "item_desc", "denom_qty", "qty_received", "received_from",
+                          "received_by", "remarks", "created_utc"],
+    "spares_issue": ["id", "sl_no", "part_no", "description", "lf_no", "item", "qty_issued", "balance", "issued_to",
+                     "remarks", "created_utc"],
+    "demand_supply": ["id", "patt_no", "description", "mand_dept", "lf_no", "qty_req", "qty_held", "balance",
+                      "location", "remarks", "created_utc"],
+}
+_INVENTORY_COLS_SQL = ",".join(TABLE_COLUMNS["inventory"])
+INTEGER_COLUMNS = {"qty_per_gt", "qty_received", "qty_issued", "total_qty", "balance", "delta", "qty_req", "qty_held"}
 
 # ---------------------------
 # CRUD: Inventory + Transactions + Other Forms
@@ -154,12 +439,15 @@ def _run(sql, params=(), fetch=False):
 def add_inventory_record(s_no, sl_no_contract, set_patt_no, part_no, description, denomination, type_, qty_per_gt,
                          mdnd_def, lf_no, location_bin, received_from_whom, qty_received, issued_to_whom, qty_issued,
                          total_qty, balance, remarks):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
-    _run("""INSERT INTO inventory (id,s_no,sl_no_contract,set_patt_no,part_no,description,denomination,type,qty_per_gt,mdnd_def,lf_no,location_bin,received_from_whom,qty_received,issued_to_whom,qty_issued,total_qty,balance,remarks,created_utc,modified_utc)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+    """Returns the new row."""
+    now = datetime.datetime.utcnow().isoformat() + "Z"
+    rows = _run(f"""INSERT INTO inventory (id,s_no,sl_no_contract,set_patt_no,part_no,description,denomination,type,qty_per_gt,mdnd_def,lf_no,location_bin,received_from_whom,qty_received,issued_to_whom,qty_issued,total_qty,balance,remarks,created_utc,modified_utc)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) RETURNING {_INVENTORY_COLS_SQL}""",
          (str(uuid4()), s_no, sl_no_contract, set_patt_no, part_no, description, denomination, type_, qty_per_gt,
           mdnd_def, lf_no, location_bin, received_from_whom, qty_received, issued_to_whom, qty_issued,
-          total_qty, balance, remarks, now, now))
+          total_qty, balance, remarks, now, now), fetch=True)
+    _index_after_commit(rows)
+    return rows[0]
 
 def list_inventory():
     return _run("SELECT id,s_no,sl_no_contract,set_patt_no,part_no,description,denomination,type,qty_per_gt,mdnd_def,lf_no,location_bin,received_from_whom,qty_received,issued_to_whom,qty_issued,total_qty,balance,remarks,created_utc,modified_utc FROM inventory ORDER BY created_utc DESC", fetch=True)
@@ -175,39 +463,245 @@ def get_inventory_by_partno(part_no):
 def update_inventory(id_, s_no, sl_no_contract, set_patt_no, part_no, description, denomination, type_, qty_per_gt,
                      mdnd_def, lf_no, location_bin, received_from_whom, qty_received, issued_to_whom, qty_issued,
                      total_qty, balance, remarks):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
-    _run("""UPDATE inventory SET s_no=?, sl_no_contract=?, set_patt_no=?, part_no=?, description=?, denomination=?, type=?, qty_per_gt=?, mdnd_def=?, lf_no=?, location_bin=?, received_from_whom=?, qty_received=?, issued_to_whom=?, qty_issued=?, total_qty=?, balance=?, remarks=?, modified_utc=? WHERE id=?""",
+    """Returns the updated row (None if id_ doesn't exist)."""
+    now = datetime.datetime.utcnow().isoformat() + "Z"
+    rows = _run(f"""UPDATE inventory SET s_no=?, sl_no_contract=?, set_patt_no=?, part_no=?, description=?, denomination=?, type=?, qty_per_gt=?, mdnd_def=?, lf_no=?, location_bin=?, received_from_whom=?, qty_received=?, issued_to_whom=?, qty_issued=?, total_qty=?, balance=?, remarks=?, modified_utc=? WHERE id=?
+         RETURNING {_INVENTORY_COLS_SQL}""",
          (s_no, sl_no_contract, set_patt_no, part_no, description, denomination, type_, qty_per_gt,
           mdnd_def, lf_no, location_bin, received_from_whom, qty_received, issued_to_whom, qty_issued,
-          total_qty, balance, remarks, now, id_))
+          total_qty, balance, remarks, now, id_), fetch=True)
+    _index_after_commit(rows)
+    return rows[0] if rows else None
 
 def delete_inventory(id_):
-    _run("DELETE FROM inventory WHERE id = ?", (id_,))
+    rows = _run("DELETE FROM inventory WHERE id = ? RETURNING id", (id_,), fetch=True)
+    _index_after_commit(deleted_ids=[r[0] for r in rows])
 
 # transactions
 def log_transaction(part_no, delta, tx_type, reason="", source="manual"):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
+    now = datetime.datetime.utcnow().isoformat() + "Z"
     _run("INSERT INTO transactions (id, part_no, delta, tx_type, reason, source, created_utc) VALUES (?,?,?,?,?,?,?)",
          (str(uuid4()), part_no, delta, tx_type, reason, source, now))
 
 def adjust_qty_by_partno(part_no, delta, reason="", source="manual"):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
-    _run("UPDATE inventory SET total_qty = COALESCE(total_qty,0) + ?, balance = COALESCE(balance,0) + ?, modified_utc = ? WHERE part_no = ?",
-         (delta, delta, now, part_no))
+    """Returns the updated inventory row(s) so callers can patch views in place."""
+    # balance update and ledger entry commit together or not at all
+    now = datetime.datetime.utcnow().isoformat() + "Z"
     tx_type = "IN" if delta > 0 else "OUT"
-    log_transaction(part_no, delta, tx_type, reason, source)
+    with transaction():
+        rows = _run(f"UPDATE inventory SET total_qty = COALESCE(total_qty,0) + ?, balance = COALESCE(balance,0) + ?, modified_utc = ? WHERE part_no = ? RETURNING {_INVENTORY_COLS_SQL}",
+                    (delta, delta, now, part_no), fetch=True)
+        _run("INSERT INTO transactions (id, part_no, delta, tx_type, reason, source, created_utc) VALUES (?,?,?,?,?,?,?)",
+             (str(uuid4()), part_no, delta, tx_type, reason, source, now))
+        _index_after_commit(rows)
+    return rows
+
+def adjust_many(adjustments, source="manual"):
+    """
+    Post a burst of adjustments in one transaction (one commit / fsync).
+    `adjustments` is an iterable of (part_no, delta, reason) or
+    (part_no, delta, reason, source). Every item gets its own ledger row;
+    balances are updated once per distinct part_no. Returns the updated
+    inventory rows.
+    """
+    now = datetime.datetime.utcnow().isoformat() + "Z"
+    ledger, totals = [], {}
+    for adj in adjustments:
+        part_no, delta, reason = adj[0], int(adj[1]), adj[2] if len(adj) > 2 else ""
+        src = adj[3] if len(adj) > 3 else source
+        ledger.append((str(uuid4()), part_no, delta, "IN" if delta > 0 else "OUT", reason, src, now))
+        totals[part_no] = totals.get(part_no, 0) + delta
+    if not ledger:
+        return []
+    db = get_db()
+    rows = []
+    with db.transaction() as conn:
+        conn.executemany("UPDATE inventory SET total_qty = COALESCE(total_qty,0) + ?, balance = COALESCE(balance,0) + ?, modified_utc = ? WHERE part_no = ?",
+                         [(d, d, now, p) for p, d in totals.items()])
+        conn.executemany("INSERT INTO transactions (id, part_no, delta, tx_type, reason, source, created_utc) VALUES (?,?,?,?,?,?,?)",
+                         ledger)
+        parts = list(totals)
+        for i in range(0, len(parts), 500):  # stay under SQLite's bound-parameter limit
+            chunk = parts[i:i + 500]
+            rows += conn.execute(f"SELECT {_INVENTORY_COLS_SQL} FROM inventory WHERE part_no IN ({','.join('?' * len(chunk))})",
+                                 chunk).fetchall()
+        _index_after_commit(rows)
+    return rows
+
+# ---------------------------
+# PART NUMBER INDEX
+# ---------------------------
+class PartIndex:
+    """
+    Process-wide map part_no -> (id, description, balance, location_bin) so the
+    scanner can validate a part and show its description without touching
+    the DB. part_no isn't unique, so each part keeps all of its rows and a
+    part stays known until the last of them is deleted or renamed. Writes made through this module update it after they commit;
+    writes from other processes are detected with PRAGMA data_version (checked
+    at most every CHECK_INTERVAL seconds) and pulled in by modified_utc.
+    """
+    CHECK_INTERVAL = 0.5
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_part = {}  # part_no -> {id: entry}, oldest loaded first
+        self._part_of = {}  # id -> part_no, so renames/deletes drop the old key
+        self._loaded = False
+        self._max_modified = ""
+        self._versions = {}  # thread ident -> last PRAGMA data_version seen
+        self._checked_at = 0.0
+
+    def _data_version(self):
+        return get_db().connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def _drop(self, id_):
+        part = self._part_of.pop(id_, None)
+        rows = self._by_part.get(part)
+        if rows is not None:
+            rows.pop(id_, None)
+            if not rows:
+                del self._by_part[part]
+
+    def _put(self, id_, part_no, description, balance, location_bin, modified):
+        if self._part_of.get(id_, part_no) != part_no:
+            self._drop(id_)
+        if part_no is not None:
+            self._by_part.setdefault(part_no, {})[id_] = (id_, description, balance, location_bin)
+            self._part_of[id_] = part_no
+        if modified and modified > self._max_modified:
+            self._max_modified = modified
+
+    def load(self):
+        """(Re)load the whole index; cheap enough for a few hundred thousand parts."""
+        with self._lock:
+            self._by_part, self._part_of, self._max_modified = {}, {}, ""
+            for r in _run("SELECT id, part_no, description, balance, location_bin, modified_utc FROM inventory", fetch=True):
+                self._put(*r)
+            self._versions = {threading.get_ident(): self._data_version()}
+            self._checked_at = time.monotonic()
+            self._loaded = True
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def _refresh_external(self):
+        rows = _run("SELECT id, part_no, description, balance, location_bin, modified_utc FROM inventory WHERE modified_utc >= ?",
+                    (self._max_modified,), fetch=True)
+        for r in rows:
+            self._put(*r)
+        # deletions (and rows written without modified_utc) don't show up by
+        # modified_utc, and a delete plus an insert leaves the count unchanged:
+        # diff the ids instead
+        ids = {r[0] for r in _run("SELECT id FROM inventory WHERE part_no IS NOT NULL", fetch=True)}
+        for id_ in set(self._part_of) - ids:
+            self._drop(id_)
+        if len(ids) != len(self._part_of):
+            self.load()  # rows we have never seen
+
+    def _check(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        key = threading.get_ident()
+        v = self._data_version()
+        if self._versions.get(key) != v:
+            self._versions[key] = v
+            self._refresh_external()
+
+    def lookup(self, part_no):
+        """(id, description, balance, location_bin) for part_no, or None if unknown."""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            else:
+                self._check()
+            rows = self._by_part.get(part_no)
+            return next(iter(rows.values())) if rows else None
+
+    def apply(self, rows=(), deleted_ids=()):
+        """Fold committed inventory rows (full TABLE_COLUMNS rows) and deletions into the index."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for r in rows or ():
+                self._put(r[0], r[4], r[5], r[17], r[11], r[20])
+            for id_ in deleted_ids or ():
+                self._drop(id_)
+
+    def __len__(self):
+        return len(self._by_part)
+
+_part_index = PartIndex()
+
+def part_index():
+    return _part_index
+
+def _index_after_commit(rows=(), deleted_ids=()):
+    if rows or deleted_ids:
+        get_db().after_commit(lambda: _part_index.apply(rows, deleted_ids))
+
+class ScanBuffer:
+    """
+    In-memory queue of scanner decrements for burst mode. add() validates the
+    part number against the part index and only queues it; flush() posts the
+    whole queue through adjust_many() in one transaction.
+    """
+
+    def __init__(self, reason="usage (scanner burst)", source="scanner"):
+        self.reason = reason
+        self.source = source
+        self.pending = []
+        self.tally = {}  # part_no -> qty queued since the last flush
+
+    def add(self, part_no, qty=1):
+        """Queue `qty` units of part_no. Returns its description, or None if unknown."""
+        entry = _part_index.lookup(part_no)
+        if entry is None:
+            return None
+        self.pending.append((part_no, -int(qty), self.reason, self.source))
+        self.tally[part_no] = self.tally.get(part_no, 0) + int(qty)
+        return entry[1] or ""
+
+    def flush(self):
+        """Commit queued scans; returns the updated inventory rows. Keeps the queue if the commit fails."""
+        if not self.pending:
+            return []
+        rows = adjust_many(self.pending, source=self.source)
+        self.pending = []
+        self.tally = {}
+        return rows
+
+    def __len__(self):
+        return len(self.pending)
 
 def list_transactions(limit=1000):
     return _run("SELECT id, part_no, delta, tx_type, reason, source, created_utc FROM transactions ORDER BY created_utc DESC LIMIT ?", (limit,), fetch=True)
 
-def search_inventory(term):
-    t = f"%{term}%"
-    return _run("""SELECT id,s_no,sl_no_contract,set_patt_no,part_no,description,denomination,type,qty_per_gt,mdnd_def,lf_no,location_bin,received_from_whom,qty_received,issued_to_whom,qty_issued,total_qty,balance,remarks,created_utc,modified_utc
-                   FROM inventory WHERE part_no LIKE ? OR description LIKE ? OR s_no LIKE ? ORDER BY created_utc DESC""", (t,t,t), fetch=True)
+def _fts_query(term):
+    """
+    Turn free text into an FTS5 query: each whitespace-separated word becomes a
+    phrase of its tokens with a prefix match on the last one, so "ABC-12" finds
+    part "ABC-1234". Words are ANDed. Returns "" when nothing is searchable.
+    """
+    phrases = []
+    for word in str(term).split():
+        tokens = re.findall(r"\w+", word)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases)
+
+def search_inventory(term, limit=200):
+    """bm25-ranked inventory search over FTS_COLUMNS; best `limit` matches first."""
+    return list_page("inventory", limit=limit, order_by="rank", search=term)[0]
+
+def rebuild_search_index():
+    _run("INSERT INTO inventory_fts(inventory_fts) VALUES ('rebuild')")
 
 # Certified receipt CRUD
 def save_certified_receipt(set_no, part_no, item_desc, denom_qty, qty_received, received_from, received_by, remarks):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
+    now = datetime.datetime.utcnow().isoformat() + "Z"
     _run("INSERT INTO certified_receipt (id,set_no,part_no,item_desc,denom_qty,qty_received,received_from,received_by,remarks,created_utc) VALUES (?,?,?,?,?,?,?,?,?,?)",
          (str(uuid4()), set_no, part_no, item_desc, denom_qty, qty_received, received_from, received_by, remarks, now))
 
@@ -216,7 +710,7 @@ def list_certified_receipt():
 
 # Spares issue CRUD
 def save_spares_issue(sl_no, part_no, description, lf_no, item, qty_issued, balance, issued_to, remarks):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
+    now = datetime.datetime.utcnow().isoformat() + "Z"
     _run("INSERT INTO spares_issue (id,sl_no,part_no,description,lf_no,item,qty_issued,balance,issued_to,remarks,created_utc) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
          (str(uuid4()), sl_no, part_no, description, lf_no, item, qty_issued, balance, issued_to, remarks, now))
 
@@ -225,201 +719,897 @@ def list_spares_issue():
 
 # Demand supply CRUD
 def save_demand_supply(patt_no, description, mand_dept, lf_no, qty_req, qty_held, balance, location, remarks):
-    now = datetime.datetime.datetime.utcnow().isoformat() + "Z"
+    now = datetime.datetime.utcnow().isoformat() + "Z"
     _run("INSERT INTO demand_supply (id,patt_no,description,mand_dept,lf_no,qty_req,qty_held,balance,location,remarks,created_utc) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
          (str(uuid4()), patt_no, description, mand_dept, lf_no, qty_req, qty_held, balance, location, remarks, now))
 
 def list_demand_supply():
     return _run("SELECT id,patt_no,description,mand_dept,lf_no,qty_req,qty_held,balance,location,remarks,created_utc FROM demand_supply ORDER BY created_utc DESC", fetch=True)
 
+# Vouchers: the columns each voucher PDF takes, in order (see core_pdf.FORM_TEMPLATES)
+VOUCHER_COLUMNS = {
+    "certified_receipt": ("id", "set_no", "part_no", "item_desc", "denom_qty", "qty_received", "received_from", "received_by", "remarks", "created_utc"),
+    "spares_issue": ("id", "sl_no", "part_no", "description", "lf_no", "item", "qty_issued", "balance", "issued_to", "remarks", "created_utc"),
+    "demand_supply": ("id", "patt_no", "description", "mand_dept", "lf_no", "qty_req", "qty_held", "balance", "location", "remarks", "created_utc"),
+}
+
+def _date_range_where(date_from=None, date_to=None, column="created_utc"):
+    """([conditions], [params]) for an inclusive "YYYY-MM-DD" date range on `column`."""
+    where, params = [], []
+    if date_from:
+        where.append(f"{column} >= ?"); params.append(str(date_from))
+    if date_to:
+        # dates are ISO strings: everything on date_to sorts below the next day
+        nxt = datetime.date.fromisoformat(str(date_to)) + datetime.timedelta(days=1)
+        where.append(f"{column} < ?"); params.append(nxt.isoformat())
+    return where, params
+
+def get_vouchers(table, ids=None, date_from=None, date_to=None):
+    """
+    Voucher records for printing, oldest first: the given `ids`, and/or those
+    created between date_from and date_to (inclusive, "YYYY-MM-DD").
+    """
+    if table not in VOUCHER_COLUMNS:
+        raise ValueError(f"not a voucher table: {table}")
+    sql = f"SELECT {', '.join(VOUCHER_COLUMNS[table])} FROM {table}"
+    where, params = _date_range_where(date_from, date_to)
+    if ids is None:
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return _run(sql + " ORDER BY created_utc, id", params, fetch=True)
+    rows = []
+    ids = list(ids)
+    for i in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+        chunk = ids[i:i + 500]
+        cond = where + [f"id IN ({','.join('?' * len(chunk))})"]
+        rows += _run(sql + " WHERE " + " AND ".join(cond), params + chunk, fetch=True)
+    rows.sort(key=lambda r: (r[-1] or "", r[0]))
+    return rows
+
+# Keyset pagination: pages are ordered by (sort key, id), newest first by
+# default, and the continuation token is that pair from the last row, so every
+# page is a range seek from where the previous one ended instead of an OFFSET.
+def list_page(table, after=None, limit=500, columns=None, order_by="created_utc", descending=True, search=None):
+    """
+    Returns (rows, next_token). Pass next_token back as `after` to get the next
+    page; it is None on the last page. `columns` selects a subset of
+    TABLE_COLUMNS[table] (default: all, in that order). `order_by` may be any
+    column of the table. `search` (inventory only) restricts rows to FTS matches;
+    with order_by="rank" they come best match first (descending relevance),
+    as in search_inventory().
+    """
+    if table not in PAGED_TABLES:
+        raise ValueError(f"Unknown table {table!r}")
+    cols = list(columns) if columns else TABLE_COLUMNS[table]
+    if order_by == "rank":
+        if search is None:
+            raise ValueError("order_by='rank' needs a search term")
+        return _list_search_page(cols, search, after, limit, descending)
+    unknown = [c for c in cols + [order_by] if c not in TABLE_COLUMNS[table]]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table}: {', '.join(unknown)}")
+    limit = max(1, int(limit))
+    # created_utc/id are never NULL (migration 4); other columns may be, and a
+    # NULL key would drop out of the row-value comparison below. The stand-ins
+    # sort lowest, as NULL does.
+    if order_by in ("created_utc", "id"):
+        key = order_by
+    elif order_by in INTEGER_COLUMNS:
+        key = f"IFNULL({order_by}, -9223372036854775808)"
+    else:
+        key = f"IFNULL({order_by}, '')"
+    sql = f"SELECT {','.join(cols)},{key},id FROM {table}"
+    where, params = [], []
+    if search is not None:
+        if table != "inventory":
+            raise ValueError("search is only supported for inventory")
+        q = _fts_query(search)
+        if not q:
+            return [], None
+        where.append("rowid IN (SELECT rowid FROM inventory_fts WHERE inventory_fts MATCH ?)")
+        params.append(q)
+    if after is not None:
+        where.append(f"({key}, id) {'<' if descending else '>'} (?, ?)")
+        params += [after[0], after[1]]
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    direction = "DESC" if descending else "ASC"
+    sql += f" ORDER BY {key} {direction}, id {direction} LIMIT ?"
+    params.append(limit + 1)
+    rows = _run(sql, params, fetch=True)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_token = (rows[-1][-2], rows[-1][-1]) if more else None
+    return [r[:-2] for r in rows], next_token
+
+def _list_search_page(cols, search, after, limit, descending=True):
+    # keyset on (bm25 rank, id), id breaking ties between equal scores. As a
+    # sort key "rank" means relevance, so descending (the default) is best
+    # match first -- which is ascending bm25, lower being better.
+    unknown = [c for c in cols if c not in TABLE_COLUMNS["inventory"]]
+    if unknown:
+        raise ValueError(f"Unknown columns for inventory: {', '.join(unknown)}")
+    q = _fts_query(search)
+    if not q:
+        return [], None
+    limit = max(1, int(limit))
+    direction, op = ("ASC", ">") if descending else ("DESC", "<")
+    sql = (f"SELECT {','.join('i.' + c for c in cols)},f.rank,i.id FROM inventory_fts f "
+           "JOIN inventory i ON i.rowid = f.rowid WHERE inventory_fts MATCH ?")
+    params = [q]
+    if after is not None:
+        sql += f" AND (f.rank, i.id) {op} (?, ?)"
+        params += [after[0], after[1]]
+    sql += f" ORDER BY f.rank {direction}, i.id {direction} LIMIT ?"
+    params.append(limit + 1)
+    rows = _run(sql, params, fetch=True)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_token = (rows[-1][-2], rows[-1][-1]) if more else None
+    return [r[:-2] for r in rows], next_token
+
+def iter_pages(table, limit=500, columns=None, after=None):
+    """Yield successive pages of list_page() until the table is exhausted."""
+    while True:
+        rows, after = list_page(table, after=after, limit=limit, columns=columns)
+        if rows:
+            yield rows
+        if after is None:
+            return
+
+def list_inventory_page(after=None, limit=500, columns=None):
+    return list_page("inventory", after, limit, columns)
+
+def list_transactions_page(after=None, limit=500, columns=None):
+    return list_page("transactions", after, limit, columns)
+
+def list_certified_receipt_page(after=None, limit=500, columns=None):
+    return list_page("certified_receipt", after, limit, columns)
+
+def list_spares_issue_page(after=None, limit=500, columns=None):
+    return list_page("spares_issue", after, limit, columns)
+
+def list_demand_supply_page(after=None, limit=500, columns=None):
+    return list_page("demand_supply", after, limit, columns)
+
+# ---------------------------
+# REPORTS
+# ---------------------------
+# The inventory report streams only the columns it prints, straight from a
+# cursor in fetchmany() chunks; subtotals come from GROUP BY queries, so no
+# report ever holds the whole table in memory.
+REPORT_COLUMNS = ("part_no", "description", "total_qty")
+REPORT_GROUP_COLUMNS = ("location_bin", "type")
+
+def _report_group_by(group_by):
+    group_by = tuple(group_by or ())
+    bad = [c for c in group_by if c not in REPORT_GROUP_COLUMNS]
+    if bad:
+        raise ValueError(f"can't group the report by {', '.join(bad)}; choose from {', '.join(REPORT_GROUP_COLUMNS)}")
+    return group_by
+
+def iter_inventory_report(group_by=(), chunk_size=2000):
+    """
+    Yield (part_no, description, total_qty, *group values) rows. Ungrouped
+    rows are newest first (like list_inventory); grouped rows are ordered by
+    the group columns, then part_no.
+    """
+    group_by = _report_group_by(group_by)
+    order = ", ".join(group_by + ("part_no",)) if group_by else "created_utc DESC, id DESC"
+    cur = get_db().connection().execute(
+        f"SELECT {', '.join(REPORT_COLUMNS + group_by)} FROM inventory ORDER BY {order}")
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cur.close()
+
+def inventory_report_totals(group_by=()):
+    """
+    {group prefix: (items, qty)} for every grouping level: () is the grand
+    total, (bin,) a location subtotal, (bin, type) a type-within-bin one.
+    """
+    group_by = _report_group_by(group_by)
+    totals = {}
+    for k in range(len(group_by) + 1):
+        cols = group_by[:k]
+        sql = f"SELECT {', '.join(cols + ('COUNT(*)', 'IFNULL(SUM(total_qty), 0)'))} FROM inventory"
+        if cols:
+            sql += f" GROUP BY {', '.join(cols)}"
+        for r in _run(sql, fetch=True):
+            totals[tuple(r[:k])] = (r[k], r[k + 1])
+    return totals
+
+def inventory_report(group_by=(), chunk_size=2000):
+    """
+    (totals, rows) as from inventory_report_totals() and iter_inventory_report(),
+    both read inside one read transaction so the subtotals match the rows even
+    while other connections keep writing. The transaction ends when `rows` is
+    exhausted or closed.
+    """
+    rows = _inventory_report_snapshot(_report_group_by(group_by), chunk_size)
+    return next(rows), rows
+
+def _inventory_report_snapshot(group_by, chunk_size):
+    conn = get_db().connection()
+    own = not conn.in_transaction  # inside transaction() the snapshot is already there
+    if own:
+        conn.execute("BEGIN")  # deferred: the WAL snapshot is taken by the first SELECT
+    try:
+        yield inventory_report_totals(group_by)
+        yield from iter_inventory_report(group_by, chunk_size)
+    finally:
+        if own:
+            conn.execute("COMMIT")
+
+# ---------------------------
+# QUERY PLAN CHECK
+# ---------------------------
+# Representative shapes of the hot core queries. explain_core_queries() runs
+# EXPLAIN QUERY PLAN on each so a regression back to full scans or temp-sort
+# b-trees shows up (`python core.py explain`).
+CORE_QUERY_PLANS = [
+    ("get_inventory_by_id", "SELECT * FROM inventory WHERE id = ?", ("x",)),
+    ("get_inventory_by_partno", "SELECT * FROM inventory WHERE part_no = ?", ("x",)),
+    ("adjust_qty_by_partno", "UPDATE inventory SET total_qty = COALESCE(total_qty,0) + ?, balance = COALESCE(balance,0) + ?, modified_utc = ? WHERE part_no = ?", (0, 0, "", "x")),
+    ("list_inventory", "SELECT * FROM inventory ORDER BY created_utc DESC", ()),
+    ("list_transactions", "SELECT * FROM transactions ORDER BY created_utc DESC LIMIT ?", (1,)),
+    ("transactions_for_part", "SELECT * FROM transactions WHERE part_no = ? ORDER BY created_utc DESC", ("x",)),
+    ("list_certified_receipt", "SELECT * FROM certified_receipt ORDER BY created_utc DESC", ()),
+    ("list_spares_issue", "SELECT * FROM spares_issue ORDER BY created_utc DESC", ()),
+    ("list_demand_supply", "SELECT * FROM demand_supply ORDER BY created_utc DESC", ()),
+    ("list_page", "SELECT * FROM inventory WHERE (created_utc, id) < (?, ?) ORDER BY created_utc DESC, id DESC LIMIT ?", ("", "", 1)),
+    ("inventory_report", "SELECT part_no, description, total_qty FROM inventory ORDER BY created_utc DESC, id DESC", ()),
+    ("inventory_report_grouped", "SELECT part_no, description, total_qty, location_bin, type FROM inventory ORDER BY location_bin, type, part_no", ()),
+    ("inventory_report_totals", "SELECT location_bin, type, COUNT(*), IFNULL(SUM(total_qty), 0) FROM inventory GROUP BY location_bin, type", ()),
+    ("export", "SELECT * FROM transactions ORDER BY created_utc, id", ()),
+    ("export_date_range", "SELECT * FROM transactions WHERE created_utc >= ? AND created_utc < ? ORDER BY created_utc, id", ("", "")),
+    ("search_inventory", "SELECT i.* FROM inventory_fts JOIN inventory i ON i.rowid = inventory_fts.rowid WHERE inventory_fts MATCH ? ORDER BY inventory_fts.rank LIMIT ?", ('"x"*', 1)),
+]
+
+def explain_core_queries(conn=None):
+    """
+    Returns [(name, plan_lines, problems)] for CORE_QUERY_PLANS. `problems`
+    lists plan steps that are full table scans or temp b-tree sorts.
+    """
+    conn = conn or get_db().connection()
+    report = []
+    for name, sql, params in CORE_QUERY_PLANS:
+        plan = [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+        problems = [p for p in plan
+                    if (p.startswith("SCAN ") and " USING " not in p and "VIRTUAL TABLE" not in p)
+                    or "TEMP B-TREE" in p]
+        report.append((name, plan, problems))
+    return report
+
+# ---------------------------
+# BULK IMPORT (CSV / XLSX)
+# ---------------------------
+# tables that can be bulk loaded, with the columns of which at least one must be
+# filled (same rule the entry forms enforce)
+IMPORT_REQUIRED_ANY = {
+    "inventory": ("part_no",),
+    "certified_receipt": ("set_no", "part_no"),
+    "spares_issue": ("sl_no", "part_no"),
+    "demand_supply": ("patt_no", "description"),
+}
+# spreadsheet headers that don't normalise to a column name on their own
+IMPORT_ALIASES = {
+    "sno": "s_no", "sl_no_of_contract": "sl_no_contract", "lf_no_mgt_no": "lf_no", "location": "location_bin",
+    "received_from": "received_from_whom", "issued_to": "issued_to_whom", "qty": "total_qty",
+    "item_description": "item_desc", "denomination_qty": "denom_qty", "pattern_no": "patt_no",
+    "qty_required": "qty_req",
+}
+
+def _normalise_header(name):
+    return re.sub(r"[^0-9a-z]+", "_", str(name).strip().lower()).strip("_") or str(name)
+
+def _import_column_map(table, headers, column_map=None):
+    """Map source headers onto `table` columns; unknown headers are dropped."""
+    wanted = set(TABLE_COLUMNS[table]) - {"id", "modified_utc"}
+    column_map = column_map or {}
+    mapping = {}
+    for h in headers:
+        if h in column_map:
+            mapping[h] = column_map[h]
+            continue
+        norm = _normalise_header(h)
+        col = norm if norm in wanted else IMPORT_ALIASES.get(norm)
+        if col in wanted and col not in mapping.values():
+            mapping[h] = col
+    return mapping
+
+def _read_import_chunks(path, chunk_size, sheet=None):
+    import pandas as pd
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm", ".xls"):
+        # read_excel has no chunked mode; slice the frame instead
+        df = pd.read_excel(path, sheet_name=sheet or 0, dtype=str, keep_default_na=False)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size,
+                               encoding="utf-8-sig", skipinitialspace=True)
+
+def import_table(table, path, column_map=None, chunk_size=10000, sheet=None, dry_run=False,
+                 progress=None, rejects_path=None):
+    """
+    Bulk load a CSV or Excel file into `table` (see IMPORT_REQUIRED_ANY).
+    Each chunk is validated and written with executemany in one transaction.
+    `progress(rows_read, inserted, rejected)` is called after every chunk.
+    Returns {"inserted": n, "rejected": [(line_no, reason, row_dict), ...], "columns": mapping}.
+    Rejected rows are also written to `rejects_path` as CSV when given.
+    """
+    if table not in IMPORT_REQUIRED_ANY:
+        raise ValueError(f"Cannot import into {table!r}; choose one of {', '.join(IMPORT_REQUIRED_ANY)}")
+    cols = [c for c in TABLE_COLUMNS[table] if c != "id"]
+    stamp_modified = "modified_utc" in cols
+    required = IMPORT_REQUIRED_ANY[table]
+    sql = f"INSERT INTO {table} (id,{','.join(cols)}) VALUES ({','.join('?' * (len(cols) + 1))})"
+    db = get_db()
+    inserted, rejected, rows_read, mapping = 0, [], 0, None
+    line_no = 2  # line 1 is the header
+    for chunk in _read_import_chunks(path, chunk_size, sheet):
+        if mapping is None:
+            mapping = _import_column_map(table, list(chunk.columns), column_map)
+            if not any(c in mapping.values() for c in required):
+                raise ValueError(f"No column maps to {' / '.join(required)}; headers: {list(chunk.columns)}")
+        raw = chunk.to_dict("records")
+        data = chunk[list(mapping)].rename(columns=mapping)
+        now = datetime.datetime.utcnow().isoformat() + "Z"
+        params = []
+        for i, rec in enumerate(data.to_dict("records")):
+            row, err = {}, None
+            for col, val in rec.items():
+                val = val.strip() if isinstance(val, str) else val
+                if val == "":
+                    val = None
+                if val is not None and col in INTEGER_COLUMNS:
+                    try:
+                        num = float(val.replace(",", ""))
+                    except ValueError:
+                        err = f"{col}: {val!r} is not a number"; break
+                    if not math.isfinite(num):  # "nan"/"inf" parse as floats
+                        err = f"{col}: {val!r} is not a number"; break
+                    if num != int(num):
+                        err = f"{col}: {val!r} is not a whole number"; break
+                    val = int(num)
+                row[col] = val
+            if err is None and not any(row.get(c) for c in required):
+                err = f"missing {' / '.join(required)}"
+            if err is not None:
+                rejected.append((line_no + i, err, raw[i]))
+                continue
+            created = row.get("created_utc") or now
+            values = [row.get(c) for c in cols]
+            values[cols.index("created_utc")] = created
+            if stamp_modified:
+                values[cols.index("modified_utc")] = now
+            params.append([str(uuid4())] + values)
+        if params and not dry_run:
+            db.run_many(sql, params)
+            if table == "inventory":
+                _part_index.invalidate()
+        inserted += len(params)
+        rows_read += len(chunk)
+        line_no += len(chunk)
+        if progress:
+            progress(rows_read, inserted, len(rejected))
+    if rejects_path and rejected:
+        import csv
+        with open(rejects_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            headers = list(rejected[0][2])
+            writer.writerow(["line", "reason"] + headers)
+            for line, reason, raw_row in rejected:
+                writer.writerow([line, reason] + [raw_row.get(h, "") for h in headers])
+    return {"inserted": inserted, "rejected": rejected, "columns": mapping or {}}
+
+# ---------------------------
+# EXPORT (CSV)
+# ---------------------------
+# Exports stream from a cursor in fetchmany() chunks straight into the file,
+# oldest first along the (created_utc, id) index, so any table of any size
+# goes out in constant memory and nothing is capped.
+EXPORT_TABLES = PAGED_TABLES
+# the part-number column the part_no filter applies to
+EXPORT_PART_COLUMN = {"demand_supply": "patt_no"}
+
+def _export_query(table, columns=None, date_from=None, date_to=None, part_no=None):
+    """(columns, FROM/WHERE sql, params) for an export of `table`."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Cannot export {table!r}; choose one of {', '.join(EXPORT_TABLES)}")
+    columns = list(columns or TABLE_COLUMNS[table])
+    bad = [c for c in columns if c not in TABLE_COLUMNS[table]]
+    if bad:
+        raise ValueError(f"{table} has no column {', '.join(bad)}")
+    where, params = _date_range_where(date_from, date_to)
+    if part_no:
+        col = EXPORT_PART_COLUMN.get(table, "part_no")
+        if part_no.endswith("*"):
+            # prefix match; GLOB (unlike LIKE) is case-sensitive and can use the index
+            prefix = re.sub(r"([*?\[])", r"[\1]", part_no[:-1])
+            where.append(f"{col} GLOB ?"); params.append(prefix + "*")
+        else:
+            where.append(f"{col} = ?"); params.append(part_no)
+    sql = f" FROM {table}" + (" WHERE " + " AND ".join(where) if where else "")
+    return columns, sql, params
+
+def count_export(table, date_from=None, date_to=None, part_no=None):
+    _cols, sql, params = _export_query(table, None, date_from, date_to, part_no)
+    return _run("SELECT COUNT(*)" + sql, params, fetch=True)[0][0]
+
+def iter_export(table, columns=None, date_from=None, date_to=None, part_no=None, chunk_size=5000):
+    """Yield rows of `columns` from `table`, oldest first, matching the filters."""
+    columns, sql, params = _export_query(table, columns, date_from, date_to, part_no)
+    cur = get_db().connection().execute(f"SELECT {', '.join(columns)}{sql} ORDER BY created_utc, id", params)
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cur.close()
+
+def export_csv(table, path, columns=None, date_from=None, date_to=None, part_no=None, chunk_size=5000, progress=None):
+    """
+    Write `table` (optionally just `columns`, a created_utc date range and/or
+    a part_no -- exact, or a prefix ending in "*") to the CSV at `path`, with
+    a header row. `progress(rows_written, total)` is called every chunk.
+    The file only appears once complete; returns the number of rows written.
+    """
+    import csv
+    columns = _export_query(table, columns)[0]
+    total = count_export(table, date_from, date_to, part_no) if progress else 0
+    tmp = path + ".part"
+    done = 0
+    rows = iter_export(table, columns, date_from, date_to, part_no, chunk_size)
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            if progress: progress(0, total)
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                done += len(chunk)
+                if progress: progress(done, total)
+        os.replace(tmp, path)
+    except BaseException:
+        rows.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return done
+
+# ---------------------------
+# EXPORT (Parquet / Arrow)
+# ---------------------------
+# Columnar copies of a table for analysis, one directory per month of
+# created_utc in the hive layout pandas/pyarrow/DuckDB understand
+# (<out_dir>/<table>/month=YYYY-MM/part-0.parquet). Rows stream through
+# iter_export() in chunks and arrive in created_utc order, so only the
+# current month's writer is ever open. Integer columns are int64 and the
+# *_utc columns real UTC timestamps, instead of CSV text.
+# Needs pyarrow (requirements.txt), imported only when used.
+COLUMNAR_FORMATS = {"parquet": ".parquet", "feather": ".arrow"}
+TIMESTAMP_COLUMNS = {"created_utc", "modified_utc"}
+_MONTH_RE = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+    def col_type(c):
+        if c in INTEGER_COLUMNS: return pa.int64()
+        if c in TIMESTAMP_COLUMNS: return pa.timestamp("us", tz="UTC")
+        return pa.string()
+    return pa.schema([(c, col_type(c)) for c in columns])
+
+def _arrow_batch(rows, columns, schema):
+    import pandas as pd
+    import pyarrow as pa
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    for c in columns:
+        if c in INTEGER_COLUMNS:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
+        elif c in TIMESTAMP_COLUMNS:
+            # pandas >= 2.0: older versions read "ISO8601" as a literal strptime format
+            df[c] = pd.to_datetime(df[c].replace("", None), format="ISO8601", utc=True, errors="coerce")
+        else:
+            df[c] = df[c].map(lambda v: v if v is None or isinstance(v, str) else str(v), na_action="ignore")
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+def _arrow_writer(path, schema, fmt):
+    import pyarrow as pa
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression="zstd")
+    return pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+def export_columnar(table, out_dir, fmt="parquet", columns=None, date_from=None, date_to=None, part_no=None,
+                    chunk_size=50000, progress=None):
+    """
+    Write `table` to <out_dir>/<table>/month=YYYY-MM/part-0.<ext> as Parquet
+    or Arrow IPC ("feather"), filtered like export_csv. created_utc is always
+    included. Rows with no usable created_utc go under month=undated. The
+    directory replaces any earlier export of the table once complete.
+    Returns {month: rows}.
+    """
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; use {', '.join(COLUMNAR_FORMATS)}")
+    columns = _export_query(table, columns)[0]
+    if "created_utc" not in columns:
+        columns.append("created_utc")
+    month_of = columns.index("created_utc")
+    schema = _arrow_schema(columns)
+    total = count_export(table, date_from, date_to, part_no) if progress else 0
+    target = os.path.join(out_dir, table)
+    tmp = target + ".part"
+    shutil.rmtree(tmp, ignore_errors=True)
+    counts, writer, month, done = {}, None, None, 0
+    rows = iter_export(table, columns, date_from, date_to, part_no, chunk_size)
+    try:
+        if progress: progress(0, total)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            # rows are in created_utc order: split the chunk where the month changes
+            for key, group in itertools.groupby(chunk, key=lambda r: str(r[month_of] or "")[:7]):
+                key = key if _MONTH_RE.fullmatch(key) else "undated"
+                group = list(group)
+                if key != month:
+                    if writer: writer.close()
+                    part_dir = os.path.join(tmp, f"month={key}")
+                    os.makedirs(part_dir, exist_ok=True)
+                    n = len(os.listdir(part_dir))  # "undated" rows can come back after a dated month
+                    writer = _arrow_writer(os.path.join(part_dir, f"part-{n}{COLUMNAR_FORMATS[fmt]}"), schema, fmt)
+                    month = key
+                writer.write_table(_arrow_batch(group, columns, schema))
+                counts[key] = counts.get(key, 0) + len(group)
+            done += len(chunk)
+            if progress: progress(done, total)
+        if writer: writer.close(); writer = None
+        os.makedirs(tmp, exist_ok=True)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp, target)
+    except BaseException:
+        rows.close()
+        if writer: writer.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return counts
+
 # ---------------------------
 # BACKUP
 # ---------------------------
-def backup_db(keep_days=30):
+def backup_db(keep_days=30, progress=None):
+    # progress(step, 3): copy, zip, rotate
     os.makedirs(BACKUP_DIR, exist_ok=True)
-    now = datetime.datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    now = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     tmp_copy = os.path.join(BACKUP_DIR, f"db_copy_{now}.db")
+    if progress: progress(0, 3)
     shutil.copy2(DB_PATH, tmp_copy)
+    if progress: progress(1, 3)
     zip_name = os.path.join(BACKUP_DIR, f"backup_{now}.zip")
     shutil.make_archive(zip_name.replace('.zip',''), 'zip', BACKUP_DIR, os.path.basename(tmp_copy))
     os.remove(tmp_copy)
+    if progress: progress(2, 3)
     # rotate
     for f in os.listdir(BACKUP_DIR):
         fp = os.path.join(BACKUP_DIR, f)
         if os.path.isfile(fp):
-            age = (datetime.datetime.datetime.utcnow() - datetime.datetime.utcfromtimestamp(os.path.getmtime(fp))).days
+            age = (datetime.datetime.utcnow() - datetime.datetime.utcfromtimestamp(os.path.getmtime(fp))).days
             if age > keep_days:
                 os.remove(fp)
 
 # ---------------------------
-# PDF / Barcode generation / printing helpers
+# PDF / Barcode generation / printing helpers (lazy)
 # ---------------------------
+# These live in submodules so importing core (and starting the UI) doesn't
+# import reportlab, python-barcode or PIL. `core.<name>` resolves them on
+# first use via the module __getattr__ below.
+_LAZY_ATTRS = {
+    "core_pdf": ("create_inventory_sheet_pdf", "create_labels_pdf", "create_label_sheet_pdf", "label_sheet", "LABEL_SHEETS",
+                 "create_inventory_report_pdf",
+                 "create_certified_receipt_pdf", "create_spares_issue_pdf", "create_demand_supply_pdf", "create_vouchers_pdf",
+                 "create_form_pdf", "template_version", "FORM_TEMPLATES",
+                 "benchmark_labels"),
+    "core_barcode": ("barcode_png", "barcode_previews", "generate_barcode_images"),
+    "core_zpl": ("zpl_labels", "epl_labels", "create_labels_raw", "RAW_FORMATS"),
+    "core_cache": ("pdf_cache", "PdfCache"),
+    "core_print": ("enum_printers", "print_pdf_shell", "print_pdf_sumatra", "send_raw"),
+}
+_LAZY_INDEX = {name: mod for mod, names in _LAZY_ATTRS.items() for name in names}
 
-def create_inventory_sheet_pdf(record, out_path=None):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"inventory_sheet_{record[4]}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4
-    margin = 15*mm
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(margin, h - margin, "INS - INVENTORY DATA SHEET")
-    c.setFont("Helvetica", 10)
-    y_top = h - margin - 20
-    left_labels = [
-        ("SNo.", record[1]), ("SL No of Contract", record[2]), ("Set Patt No", record[3]),
-        ("Part No", record[4]), ("Description", record[5]), ("Denomination", record[6]),
-        ("Type", record[7]), ("Qty Per GT", str(record[8] or "")), ("MDND/DEF", record[9]),
-        ("LF No (MGT No.)", record[10]), ("Location/Bin", record[11])
-    ]
-    x = margin; y = y_top
-    for lab, val in left_labels:
-        c.drawString(x, y, f"{lab}:"); c.drawString(x + 140, y, str(val or "")); y -= 12
-    x2 = margin + 320; y2 = y_top
-    right_labels = [
-        ("Received From Whom", record[12]), ("Qty Received", str(record[13] or "")),
-        ("Issued to Whom", record[14]), ("Qty Issued", str(record[15] or "")),
-        ("Total Qty", str(record[16] or "")), ("Balance", str(record[17] or "")), ("Remarks", record[18] or "")
-    ]
-    for lab, val in right_labels:
-        c.drawString(x2, y2, f"{lab}:"); c.drawString(x2 + 150, y2, str(val or "")); y2 -= 12
-    barcode_val = str(record[4] or "")
-    bc = code128.Code128(barcode_val, barHeight=18*mm, barWidth=0.45)
-    bc.drawOn(c, margin, y2 - 36)
-    c.showPage()
-    c.save()
-    return out_path
-
-def create_labels_pdf(part_no, name, qty, out_path=None, label_w_mm=70, label_h_mm=30):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"labels_{part_no}_{datetime.datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.pdf")
-    c = canvas.Canvas(out_path, pagesize=(label_w_mm*mm, label_h_mm*mm))
-    for i in range(max(1, int(qty))):
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(5*mm, (label_h_mm-6)*mm, (name or part_no)[:60])
-        barcode = code128.Code128(str(part_no), barHeight=12*mm, barWidth=0.34)
-        barcode.drawOn(c, 5*mm, 6*mm)
-        c.setFont("Helvetica", 9)
-        c.drawString(5*mm, 3*mm, str(part_no))
-        c.showPage()
-    c.save()
-    return out_path
-
-def create_inventory_report_pdf(rows, out_path=None, title="Inventory Report"):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"inventory_report_{datetime.datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    y = h - margin
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, y, title); y -= 18
-    c.setFont("Helvetica", 10); c.drawString(margin, y, f"Generated: {datetime.datetime.datetime.utcnow().isoformat()}Z"); y -= 14
-    col_x = [margin, margin+60*mm, margin+120*mm, margin+180*mm]
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(col_x[0], y, "Part No"); c.drawString(col_x[1], y, "Description"); c.drawRightString(w - margin, y, "Total Qty")
-    y -= 12; c.setFont("Helvetica", 9)
-    for r in rows:
-        if y < margin + 40:
-            c.showPage(); y = h - margin
-        part_no = r[4]; desc = (r[5] or "")[:40]; qty = str(r[16] or "")
-        c.drawString(col_x[0], y, str(part_no)); c.drawString(col_x[1], y, desc); c.drawRightString(w - margin, y, qty)
-        y -= 12
-    c.showPage(); c.save()
-    return out_path
-
-def create_certified_receipt_pdf(record, out_path=None):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"certified_receipt_{record[1] or 'rec'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, h - margin, "Certified Receipt Voucher")
-    y = h - margin - 30
-    labels = ["Set No", "Part No", "Item Description", "Denomination/Qty", "Qty Received", "Received From", "Received By", "Remarks"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", str(record[5] or ""), record[6] or "", record[7] or "", record[8] or ""]
-    c.setFont("Helvetica", 11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, f"{lab}:"); c.drawString(margin+140, y, str(val)); y -= 14
-    c.showPage(); c.save(); return out_path
-
-def create_spares_issue_pdf(record, out_path=None):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"spares_issue_{record[1] or 'si'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, h - margin, "Spares Issue Voucher")
-    y = h - margin - 30
-    labels = ["SL No","Part No","Description","LF No","Item","Qty Issued","Balance","Issued To","Remarks"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", record[5] or "", str(record[6] or ""), str(record[7] or ""), record[8] or "", record[9] or ""]
-    c.setFont("Helvetica",11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, f"{lab}:"); c.drawString(margin+140, y, str(val)); y -= 14
-    c.showPage(); c.save(); return out_path
-
-def create_demand_supply_pdf(record, out_path=None):
-    if out_path is None:
-        out_path = os.path.join(TMP, f"demand_supply_{record[1] or 'ds'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 14); c.drawString(margin, h - margin, "Demand on the Supply Office for Naval Stores")
-    y = h - margin - 30
-    labels = ["Pattern No","Description","Mand/Dept","LF No","Qty Required","Qty Held","Balance","Location","Remarks"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", str(record[5] or ""), str(record[6] or ""), str(record[7] or ""), record[8] or "", record[9] or ""]
-    c.setFont("Helvetica",11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, f"{lab}:"); c.drawString(margin+160, y, str(val)); y -= 14
-    c.showPage(); c.save(); return out_path
-
-# barcode images (preview)
-def generate_barcode_images(part_no, name, count, out_dir=None):
-    if out_dir is None:
-        out_dir = os.path.join(TMP, f"barcode_preview_{part_no}_{datetime.datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}")
-    os.makedirs(out_dir, exist_ok=True)
-    paths = []
-    writer = ImageWriter()
-    for i in range(max(1,int(count))):
-        base = os.path.join(out_dir, f"{part_no}_{i+1}")
-        barcode_obj = Code128(str(part_no), writer=writer)
-        fname = barcode_obj.save(base)
-        paths.append(fname)
-    return paths
-
-# printing helpers
-def enum_printers():
-    try:
-        import win32print
-        flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
-        printers = win32print.EnumPrinters(flags)
-        return [p[2] for p in printers]
-    except Exception:
-        return []
+def __getattr__(name):
+    mod = _LAZY_INDEX.get(name)
+    if mod is None:
+        raise AttributeError(f"module 'core' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(mod), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
 
-def print_pdf_shell(path):
-    try:
-        import win32api
-        win32api.ShellExecute(0, "print", path, None, ".", 0)
-        return True
-    except Exception as e:
-        print("Shell print failed:", e)
-        return False
-
-def print_pdf_sumatra(path, printer_name=None, sumatra_path=SUMATRA_PATH):
-    if not os.path.exists(sumatra_path):
-        raise FileNotFoundError("SumatraPDF not found")
-    cmd = [sumatra_path]
-    if printer_name:
-        cmd += ["-print-to", printer_name]
-    else:
-        cmd += ["-print-to-default"]
-    cmd.append(path)
-    subprocess.Popen(cmd, shell=False)
-    return True
+# ---------------------------
+# STARTUP PROFILE
+# ---------------------------
+# `python core.py startup-profile` imports the UI module in a fresh
+# interpreter under `-X importtime` and reports where the import time goes.
+# Each run appends a line to a CSV so regressions show up over time; modules
+# in STARTUP_LAZY_MODULES are meant to load on first use only and are flagged
+# if they show up at startup.
+STARTUP_LAZY_MODULES = ("reportlab", "barcode", "PIL", "pandas", "pyarrow", "core_pdf", "core_barcode", "core_print", "core_zpl")
+STARTUP_HISTORY = os.path.join(os.path.dirname(DB_PATH), "startup_profile.csv")
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def profile_imports(module="main_ui", python=None):
+    """
+    Import `module` in a new interpreter with -X importtime.
+    Returns (total_us, rows, imported): rows are (name, self_us, cumulative_us)
+    for the modules `module` imports directly, largest cumulative first;
+    imported is the set of every module loaded on the way.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (here, os.environ.get("PYTHONPATH")) if p))
+    proc = subprocess.run([python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=here, env=env)
+    if proc.returncode != 0:
+        tail = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise ValueError(f"importing {module} failed: " + ("\n".join(tail[-5:]) or f"exit {proc.returncode}"))
+    total, rows, children, imported = 0, [], [], set()
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, name = int(m.group(1)), int(m.group(2)), m.group(4)
+        depth = (len(m.group(3)) - 1) // 2  # one space at depth 0, two more per level
+        imported.add(name)
+        # children are printed before their parent
+        if depth == 1:
+            children.append((name, self_us, cum_us))
+        elif depth == 0:
+            if name == module:
+                total, rows = cum_us, children
+            children = []
+    rows.sort(key=lambda r: -r[2])
+    return total, rows, imported
+
+def _imported_lazy_modules(imported):
+    return sorted(n for n in imported if n in STARTUP_LAZY_MODULES)
+
+def record_startup_profile(module, total_us, rows, imported, history=STARTUP_HISTORY, top=5):
+    """Append one run to the history CSV (created with a header on first use)."""
+    import csv
+    os.makedirs(os.path.dirname(history) or ".", exist_ok=True)
+    new = not os.path.exists(history)
+    with open(history, "a", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        if new:
+            w.writerow(["timestamp_utc", "module", "total_ms", "lazy_imported", "top_imports"])
+        w.writerow([datetime.datetime.utcnow().isoformat() + "Z", module, f"{total_us / 1000:.1f}",
+                    " ".join(_imported_lazy_modules(imported)),
+                    " ".join(f"{n}={c / 1000:.1f}" for n, _s, c in rows[:top])])
+
+def read_startup_history(history=STARTUP_HISTORY, module=None):
+    import csv
+    if not os.path.exists(history):
+        return []
+    with open(history, newline="", encoding="utf-8") as f:
+        return [r for r in csv.DictReader(f) if module is None or r["module"] == module]
 
 # ---------------------------
-# CLI: allow running migrations only
+# CLI
 # ---------------------------
-if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1].lower() == "migrate":
-        print("Running migrations (ensure DB exists and columns are updated)...")
-        ensure_db_and_migrate()
-        print("Migrations complete.")
+def _cmd_migrate(args):
+    conn = _open_raw()
+    try:
+        current = schema_version(conn)
+        if args.status:
+            print(f"DB path: {DB_PATH}")
+            print(f"Schema version: {current} (latest {SCHEMA_VERSION})")
+            for num, desc, _fn in MIGRATIONS:
+                mark = "applied" if num <= current else "pending"
+                print(f"  {num:>3}  {mark:<8} {desc}")
+            return 0
+        print("Running migrations...")
+        applied = migrate(conn, to=args.to)
+        if applied:
+            print(f"Applied migrations: {', '.join(str(n) for n in applied)}")
+        else:
+            print("Schema already current.")
+        print(f"Schema version: {schema_version(conn)}")
         print(f"DB path: {DB_PATH}")
-    else:
+        return 0
+    finally:
+        conn.close()
+
+def _cmd_explain(args):
+    bad = 0
+    for name, plan, problems in explain_core_queries():
+        print(f"{'FAIL' if problems else 'ok  '}  {name}")
+        for line in plan:
+            print(f"        {line}")
+        bad += bool(problems)
+    print(f"{bad} of {len(CORE_QUERY_PLANS)} queries use full scans or temp sorts.")
+    return 1 if bad else 0
+
+def _cmd_import(args):
+    def progress(read, inserted, rejected):
+        print(f"\r  {read} rows read, {inserted} {'valid' if args.dry_run else 'inserted'}, {rejected} rejected",
+              end="", flush=True)
+    print(f"Importing {args.file} into {args.table}{' (dry run)' if args.dry_run else ''}...")
+    res = import_table(args.table, args.file, chunk_size=args.chunk_size, sheet=args.sheet,
+                       dry_run=args.dry_run, progress=progress, rejects_path=args.rejects)
+    print()
+    print("Columns: " + ", ".join(f"{src} -> {dst}" for src, dst in res["columns"].items()))
+    for line, reason, _row in res["rejected"][:20]:
+        print(f"  line {line}: {reason}")
+    if len(res["rejected"]) > 20:
+        print(f"  ... {len(res['rejected']) - 20} more rejected rows")
+    if res["rejected"] and args.rejects:
+        print(f"Rejected rows written to {args.rejects}")
+    print(f"Done: {res['inserted']} {'valid' if args.dry_run else 'inserted'}, {len(res['rejected'])} rejected.")
+    return 1 if res["rejected"] else 0
+
+def _cmd_export(args):
+    def progress(done, total):
+        print(f"\r  {done} of {total} rows", end="", flush=True)
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    filters = dict(columns=columns, date_from=args.date_from, date_to=args.date_to, part_no=args.part_no, progress=progress)
+    if args.format == "csv":
+        print(f"Exporting {args.table} to {args.file}...")
+        n = export_csv(args.table, args.file, chunk_size=args.chunk_size or 5000, **filters)
+        print()
+        print(f"Done: {n} rows written.")
+        return 0
+    print(f"Exporting {args.table} as {args.format} to {os.path.join(args.file, args.table)}...")
+    counts = export_columnar(args.table, args.file, args.format, chunk_size=args.chunk_size or 50000, **filters)
+    print()
+    for month, n in sorted(counts.items()):
+        print(f"  month={month}: {n} rows")
+    print(f"Done: {sum(counts.values())} rows in {len(counts)} partitions.")
+    return 0
+
+def _cmd_startup_profile(args):
+    total, rows, imported = profile_imports(args.module)
+    print(f"Import of {args.module}: {total / 1000:.1f} ms")
+    for name, self_us, cum_us in rows[:args.top]:
+        print(f"  {cum_us / 1000:9.1f} ms  {name}")
+    lazy = _imported_lazy_modules(imported)
+    if lazy:
+        print("Imported at startup but meant to be lazy: " + ", ".join(lazy))
+    if not args.no_record:
+        prev = read_startup_history(args.history, args.module)
+        record_startup_profile(args.module, total, rows, imported, args.history)
+        if prev:
+            last = float(prev[-1]["total_ms"])
+            print(f"Previous run: {last:.1f} ms ({total / 1000 - last:+.1f} ms)")
+        print(f"Recorded in {args.history}")
+    if args.budget is not None and total / 1000 > args.budget:
+        print(f"Over budget: {total / 1000:.1f} ms > {args.budget:.1f} ms")
+        return 1
+    return 1 if lazy else 0
+
+def _cmd_labels(args):
+    items = []
+    for part_no in args.part_no:
+        name = args.name
+        if name is None:
+            rec = part_index().lookup(part_no)  # (id, description, balance, location_bin)
+            if rec is None:
+                raise ValueError(f"part {part_no} not in inventory (use --name to print it anyway)")
+            name = rec[1]
+        items.append((part_no, name, args.count))
+    if args.format == "pdf":
+        from core_pdf import create_label_sheet_pdf
+        path = create_label_sheet_pdf(items, args.sheet, out_path=args.to)
+        print(f"Labels PDF: {path}")
+        return 0
+    from core_zpl import create_labels_raw
+    from core_print import send_raw
+    sink = args.to or LABEL_PRINTER
+    if not sink:
+        raise ValueError("no destination: pass --to or set LABEL_PRINTER")
+    n = send_raw(create_labels_raw(items, args.format, dpi=args.dpi), sink)
+    print(f"Sent {n} bytes of {args.format.upper()} ({sum(i[2] for i in items)} labels) to {sink}")
+    return 0
+
+def _cmd_bench_labels(args):
+    from core_pdf import benchmark_labels
+    print(f"Rendering {args.count} labels...")
+    results = benchmark_labels(args.count, baseline=not args.no_baseline)
+    for label, (secs, size) in results.items():
+        print(f"  {label:9} {secs:7.2f} s  {secs / args.count * 1e6:8.1f} us/label  {size / 1e6:8.2f} MB  {size / args.count:7.0f} B/label")
+    if "per-page" in results:
+        (ft, fs), (pt, ps) = results["forms"], results["per-page"]
+        print(f"forms vs per-page: {pt / ft:.1f}x faster, {ps / fs:.1f}x smaller")
+    return 0
+
+def _cmd_pdf_cache(args):
+    from core_cache import pdf_cache
+    cache = pdf_cache()
+    if args.clear:
+        cache.clear()
+    s = cache.stats()
+    print(f"PDF cache: {s['directory']}")
+    print(f"  {s['entries']} files, {s['bytes'] / 2**20:.1f} MB of {s['max_bytes'] / 2**20:.0f} MB")
+    return 0
+
+def _build_cli():
+    import argparse
+    parser = argparse.ArgumentParser(prog="core.py", description="INS inventory core utilities")
+    sub = parser.add_subparsers(dest="command")
+    p = sub.add_parser("migrate", help="apply schema migrations")
+    p.add_argument("--status", action="store_true", help="show applied/pending migrations and exit")
+    p.add_argument("--to", type=int, metavar="N", help="migrate up to version N (default: latest)")
+    p.set_defaults(func=_cmd_migrate)
+    p = sub.add_parser("explain", help="report EXPLAIN QUERY PLAN for core queries; non-zero exit on full scans")
+    p.set_defaults(func=_cmd_explain)
+    p = sub.add_parser("import", help="bulk load a CSV/XLSX file into a table")
+    p.add_argument("table", choices=sorted(IMPORT_REQUIRED_ANY))
+    p.add_argument("file")
+    p.add_argument("--sheet", help="Excel sheet name (default: first sheet)")
+    p.add_argument("--chunk-size", type=int, default=10000, help="rows per transaction (default 10000)")
+    p.add_argument("--rejects", metavar="CSV", help="write rejected rows with reasons to this file")
+    p.add_argument("--dry-run", action="store_true", help="validate only, insert nothing")
+    p.set_defaults(func=_cmd_import)
+    p = sub.add_parser("export", help="stream a table to a CSV file, or to Parquet/Arrow files by month")
+    p.add_argument("table", choices=EXPORT_TABLES)
+    p.add_argument("file", help="CSV file; for parquet/feather the directory to write <table>/month=YYYY-MM/ under")
+    p.add_argument("--format", choices=["csv"] + list(COLUMNAR_FORMATS), default="csv")
+    p.add_argument("--columns", help="comma-separated columns to export (default: all)")
+    p.add_argument("--from", dest="date_from", metavar="YYYY-MM-DD", help="created on or after this date")
+    p.add_argument("--to", dest="date_to", metavar="YYYY-MM-DD", help="created on or before this date")
+    p.add_argument("--part-no", help="only this part number (or a prefix ending in *)")
+    p.add_argument("--chunk-size", type=int, help="rows fetched per batch (default 5000 for csv, 50000 otherwise)")
+    p.set_defaults(func=_cmd_export)
+    p = sub.add_parser("labels", help="print labels as a PDF sheet or raw ZPL/EPL for thermal printers")
+    p.add_argument("part_no", nargs="+")
+    p.add_argument("--count", type=int, default=1, help="labels per part (default 1)")
+    p.add_argument("--name", help="label title (default: the part's description)")
+    p.add_argument("--format", choices=["pdf", "zpl", "epl"], default="zpl")
+    p.add_argument("--sheet", default="roll-70x30", help="label stock for --format pdf (default roll-70x30)")
+    p.add_argument("--dpi", type=int, default=203, help="printer resolution for zpl/epl (default 203)")
+    p.add_argument("--to", metavar="SINK", help="pdf: output path; zpl/epl: tcp://host[:port], printer:NAME or a file/port")
+    p.set_defaults(func=_cmd_labels)
+    p = sub.add_parser("bench-labels", help="time label PDF rendering (form XObjects vs per-page drawing)")
+    p.add_argument("--count", type=int, default=10000, help="labels to render (default 10000)")
+    p.add_argument("--no-baseline", action="store_true", help="skip the per-page baseline run")
+    p.set_defaults(func=_cmd_bench_labels)
+    p = sub.add_parser("pdf-cache", help="show the size of the generated-PDF cache")
+    p.add_argument("--clear", action="store_true", help="delete every cached PDF first")
+    p.set_defaults(func=_cmd_pdf_cache)
+    p = sub.add_parser("startup-profile", help="measure import time of the UI (-X importtime) and log it")
+    p.add_argument("--module", default="main_ui", help="module to import (default: main_ui)")
+    p.add_argument("--top", type=int, default=15, help="show the N slowest top-level imports (default 15)")
+    p.add_argument("--history", default=STARTUP_HISTORY, help="CSV to append the result to")
+    p.add_argument("--no-record", action="store_true", help="don't append to the history CSV")
+    p.add_argument("--budget", type=float, metavar="MS", help="non-zero exit if the import takes longer")
+    p.set_defaults(func=_cmd_startup_profile)
+    return parser
+
+def main(argv=None):
+    parser = _build_cli()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
         print("This module provides core functionality. Import it from your UI file (main_ui.py).")
+        parser.print_usage()
+        return 0
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    # lazily imported submodules do `import core`; make that this module
+    # rather than a second copy with its own connections and caches
+    sys.modules.setdefault("core", sys.modules[__name__])
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# core_barcode.py
+"""
+Barcode image generation (python-barcode + Pillow) for on-screen previews.
+Imported lazily through `core.barcode_png`, `core.barcode_previews` and
+`core.generate_barcode_images`.
+
+Each distinct barcode is rendered once into an in-memory PNG and cached by
+(part_no, symbology, size); previews show one image per distinct label with
+its count instead of one image per label.
+"""
+
+import io, os, datetime
+from functools import lru_cache
+
+import barcode
+from barcode.writer import ImageWriter
+
+import core
+
+# module width/height in mm, as python-barcode's ImageWriter takes them
+PREVIEW_SIZE = (0.2, 15.0)
+
+@lru_cache(maxsize=256)
+def barcode_png(part_no, symbology="code128", size=PREVIEW_SIZE):
+    """PNG bytes for one barcode; rendered once per (part_no, symbology, size)."""
+    module_width, module_height = size
+    code = barcode.get_barcode_class(symbology)(str(part_no), writer=ImageWriter())
+    buf = io.BytesIO()
+    code.write(buf, options={"module_width": module_width, "module_height": module_height})
+    return buf.getvalue()
+
+def barcode_previews(items, symbology="code128", size=PREVIEW_SIZE, progress=None):
+    """
+    One preview per distinct label: `items` is (part_no, name, count) as for
+    create_label_sheet_pdf; returns [(part_no, name, count, png_bytes)] with
+    counts of repeated labels merged.
+    """
+    merged = {}
+    for part_no, name, count in items:
+        key = (str(part_no), name or "")
+        merged[key] = merged.get(key, 0) + max(0, int(count))
+    out = []
+    for i, ((part_no, name), count) in enumerate(merged.items()):
+        if progress: progress(i, len(merged))
+        out.append((part_no, name, count, barcode_png(part_no, symbology, size)))
+    return out
+
+def generate_barcode_images(part_no, name, count, out_dir=None, progress=None):
+    # file copies for callers that need paths; the image itself is rendered once
+    if out_dir is None:
+        out_dir = os.path.join(core.TMP, f"barcode_preview_{part_no}_{datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}")
+    os.makedirs(out_dir, exist_ok=True)
+    png = barcode_png(part_no)
+    paths = []
+    total = max(1, int(count))
+    for i in range(total):
+        if progress and i % 100 == 0: progress(i, total)
+        fname = os.path.join(out_dir, f"{part_no}_{i+1}.png")
+        with open(fname, "wb") as f:
+            f.write(png)
+        paths.append(fname)
+    return paths
@@ -0,0 +1,128 @@
+# core_cache.py
+"""
+Content-addressed cache for generated PDFs (core.PDF_CACHE_DIR).
+
+A cached file is named after a hash of what went into it -- for a form:
+(form, record id, modified_utc, template version) -- so reprinting an
+unchanged record reuses the file, an edited record or a changed layout gets
+a new one, and two records never share a path. The directory is kept under
+core.PDF_CACHE_MAX_BYTES by evicting the least recently used files; a hit
+touches the file's mtime, so recency survives restarts.
+
+Doesn't import reportlab: `core.pdf_cache()` is cheap, and core_pdf routes
+its create_*_pdf functions through it.
+"""
+
+import hashlib, os, re, shutil, threading
+from collections import OrderedDict
+
+import core
+
+class PdfCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or core.PDF_CACHE_DIR
+        self.max_bytes = core.PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = None  # path -> size, least recently used first
+        self._bytes = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def path(self, form, key, label=""):
+        label = re.sub(r"[^\w.-]+", "_", str(label or ""))[:40]
+        return os.path.join(self.directory, f"{form}_{label + '_' if label else ''}{key[:16]}.pdf")
+
+    def _load(self):
+        # caller holds the lock
+        if self._entries is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for e in os.scandir(self.directory):
+            if e.is_file() and e.name.endswith(".pdf"):
+                st = e.stat()
+                found.append((st.st_mtime, e.path, st.st_size))
+        found.sort()
+        self._entries = OrderedDict((p, size) for _m, p, size in found)
+        self._bytes = sum(self._entries.values())
+
+    def get(self, form, parts, render, label="", out_path=None):
+        """
+        Path of the PDF for `parts` (the cache key), calling render(path) to
+        build it on a miss. With `out_path` the cached file is copied there.
+        """
+        key = self.key(form, *parts)
+        path = self.path(form, key, label)
+        with self._lock:
+            self._load()
+            hit = path in self._entries and os.path.exists(path)
+            if hit:
+                self.hits += 1
+                self._entries.move_to_end(path)
+        if hit:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        else:
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                render(tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            with self._lock:
+                self.misses += 1
+                self._bytes += os.path.getsize(path) - self._entries.pop(path, 0)
+                self._entries[path] = os.path.getsize(path)
+                self._evict(keep=path)
+        if out_path:
+            shutil.copyfile(path, out_path)
+            return out_path
+        return path
+
+    def _evict(self, keep=None):
+        # caller holds the lock; the file just produced is never evicted
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = next(iter(self._entries.items()))
+            if path == keep:
+                self._entries.move_to_end(path)
+                continue
+            del self._entries[path]
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # open in a viewer / spooler; picked up again by the next _load
+
+    def clear(self):
+        with self._lock:
+            self._load()
+            for path in list(self._entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._entries = None
+            self._load()
+
+    def stats(self):
+        with self._lock:
+            self._load()
+            return {"directory": self.directory, "entries": len(self._entries), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+_cache = None
+
+def pdf_cache():
+    """The process-wide PdfCache for core.PDF_CACHE_DIR."""
+    global _cache
+    if _cache is None:
+        _cache = PdfCache()
+    return _cache
@@ -0,0 +1,487 @@
+# core_pdf.py
+"""
+PDF generation for the INS inventory app (reportlab): inventory data sheets,
+labels, inventory report and the voucher forms.
+
+Imported lazily: `core.create_*_pdf` resolve here on first use, so sessions
+that never print don't pay for reportlab at startup.
+"""
+
+import os, datetime
+
+from reportlab.pdfgen import canvas
+from reportlab.graphics.barcode import code128
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+import core
+
+# ---------------------------
+# Form templates
+# ---------------------------
+# Each printed form is declared once here. Its static layer (title and field
+# labels) is compiled into a form XObject the first time a canvas uses it;
+# rendering a record then only places the values (and the barcode, if any).
+# Positions are in points from the page margin, as the forms were drawn by
+# hand before; values are printed as str(value or "").
+FORM_TEMPLATES = {
+    "inventory_sheet": {
+        "title": "INS - INVENTORY DATA SHEET", "title_size": 16, "margin_mm": 15,
+        "font_size": 10, "line": 12, "top": 20,
+        "columns": [
+            {"x": 0, "value_dx": 140, "fields": [
+                ("SNo.", 1), ("SL No of Contract", 2), ("Set Patt No", 3), ("Part No", 4), ("Description", 5),
+                ("Denomination", 6), ("Type", 7), ("Qty Per GT", 8), ("MDND/DEF", 9), ("LF No (MGT No.)", 10),
+                ("Location/Bin", 11)]},
+            {"x": 320, "value_dx": 150, "fields": [
+                ("Received From Whom", 12), ("Qty Received", 13), ("Issued to Whom", 14), ("Qty Issued", 15),
+                ("Total Qty", 16), ("Balance", 17), ("Remarks", 18)]},
+        ],
+        # Code128 of record[4], placed below the end of the second column
+        "barcode": {"field": 4, "below_column": 1, "dy": 36, "height_mm": 18, "bar_width": 0.45},
+    },
+    "certified_receipt": {
+        "title": "Certified Receipt Voucher", "title_size": 16, "margin_mm": 20,
+        "font_size": 11, "line": 14, "top": 30,
+        "columns": [{"x": 0, "value_dx": 140, "fields": [
+            ("Set No", 1), ("Part No", 2), ("Item Description", 3), ("Denomination/Qty", 4), ("Qty Received", 5),
+            ("Received From", 6), ("Received By", 7), ("Remarks", 8)]}],
+    },
+    "spares_issue": {
+        "title": "Spares Issue Voucher", "title_size": 16, "margin_mm": 20,
+        "font_size": 11, "line": 14, "top": 30,
+        "columns": [{"x": 0, "value_dx": 140, "fields": [
+            ("SL No", 1), ("Part No", 2), ("Description", 3), ("LF No", 4), ("Item", 5), ("Qty Issued", 6),
+            ("Balance", 7), ("Issued To", 8), ("Remarks", 9)]}],
+    },
+    "demand_supply": {
+        "title": "Demand on the Supply Office for Naval Stores", "title_size": 14, "margin_mm": 20,
+        "font_size": 11, "line": 14, "top": 30,
+        "columns": [{"x": 0, "value_dx": 160, "fields": [
+            ("Pattern No", 1), ("Description", 2), ("Mand/Dept", 3), ("LF No", 4), ("Qty Required", 5),
+            ("Qty Held", 6), ("Balance", 7), ("Location", 8), ("Remarks", 9)]}],
+    },
+}
+VOUCHER_TEMPLATES = ("certified_receipt", "spares_issue", "demand_supply")
+
+_layouts = {}
+
+def _layout(name):
+    """Template -> (value positions [(x, y, field)], barcode position or None); computed once per process."""
+    lay = _layouts.get(name)
+    if lay is None:
+        t = FORM_TEMPLATES[name]
+        w, h = A4; margin = t["margin_mm"]*mm
+        values, col_ends = [], []
+        for col in t["columns"]:
+            y = h - margin - t["top"]
+            for _label, field in col["fields"]:
+                values.append((margin + col["x"] + col["value_dx"], y, field)); y -= t["line"]
+            col_ends.append(y)
+        bc = t.get("barcode")
+        barcode = (margin, col_ends[bc["below_column"]] - bc["dy"]) if bc else None
+        lay = _layouts[name] = (values, barcode)
+    return lay
+
+def template_version(name):
+    """Short hash of a template's definition; changes whenever its layout is edited."""
+    import hashlib
+    return hashlib.sha1(repr(FORM_TEMPLATES[name]).encode()).hexdigest()[:12]
+
+def _static_form(c, name):
+    """Name of the compiled static layer of template `name` on canvas `c`."""
+    forms = c.__dict__.setdefault("_ins_templates", {})
+    form = forms.get(name)
+    if form is None:
+        t = FORM_TEMPLATES[name]
+        w, h = A4; margin = t["margin_mm"]*mm
+        form = forms[name] = f"tpl_{name}"
+        c.beginForm(form, 0, 0, w, h)
+        c.setFont("Helvetica-Bold", t["title_size"]); c.drawString(margin, h - margin, t["title"])
+        c.setFont("Helvetica", t["font_size"])
+        for col in t["columns"]:
+            y = h - margin - t["top"]
+            for label, _field in col["fields"]:
+                c.drawString(margin + col["x"], y, f"{label}:"); y -= t["line"]
+        c.endForm()
+    return form
+
+def render_form(c, name, record):
+    """Draw one `record` as a page of template `name` on canvas `c`."""
+    t = FORM_TEMPLATES[name]
+    values, barcode = _layout(name)
+    c.doForm(_static_form(c, name))
+    c.setFont("Helvetica", t["font_size"])
+    for x, y, field in values:
+        c.drawString(x, y, str(record[field] or ""))
+    if barcode:
+        bc = t["barcode"]
+        code128.Code128(str(record[bc["field"]] or ""), barHeight=bc["height_mm"]*mm, barWidth=bc["bar_width"]).drawOn(c, *barcode)
+    c.showPage()
+
+def _record_stamp(name, record):
+    # (id, version) of the row behind a form: modified_utc, or created_utc
+    # where the table has no edits (vouchers) or the row was never edited.
+    # Legacy rows can have neither; then the whole record is the key.
+    cols = core.TABLE_COLUMNS["inventory" if name == "inventory_sheet" else name]
+    for col in ("modified_utc", "created_utc"):
+        i = cols.index(col) if col in cols else len(record)
+        if i < len(record) and record[i]:
+            return (record[0], record[i]) if record[0] else tuple(record)
+    return tuple(record)
+
+def _render_form_pdf(name, record, path):
+    c = canvas.Canvas(path, pagesize=A4)
+    render_form(c, name, record)
+    c.save()
+
+def create_form_pdf(name, record, out_path=None, label=None):
+    """One-page PDF of `record` on template `name`, from the PDF cache when the record hasn't changed."""
+    return core.pdf_cache().get(name, (*_record_stamp(name, record), template_version(name)),
+                                lambda path: _render_form_pdf(name, record, path), label=label, out_path=out_path)
+
+def create_inventory_sheet_pdf(record, out_path=None):
+    return create_form_pdf("inventory_sheet", record, out_path, label=record[4])
+
+# part of the PDF cache key for labels: bump when _label_form's drawing changes
+LABEL_VERSION = 1
+
+def _label_form(c, forms, part_no, name, label_w_mm, label_h_mm):
+    """
+    Name of the form XObject holding the label for (part_no, name) on canvas
+    `c`. The barcode is encoded and its bars drawn once per distinct label;
+    every copy is then a one-line doForm reference.
+    """
+    key = (str(part_no), name or "")
+    form = forms.get(key)
+    if form is None:
+        form = forms[key] = f"label{len(forms)}"
+        c.beginForm(form, 0, 0, label_w_mm*mm, label_h_mm*mm)
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(5*mm, (label_h_mm-6)*mm, (name or str(part_no))[:60])
+        barcode = code128.Code128(str(part_no), barHeight=12*mm, barWidth=0.34)
+        barcode.drawOn(c, 5*mm, 6*mm)
+        c.setFont("Helvetica", 9)
+        c.drawString(5*mm, 3*mm, str(part_no))
+        c.endForm()
+    return form
+
+# Label stock: page size, grid, label size, margins and gutters (all mm).
+# "roll" sheets are one label per page, sized to the label (thermal printers).
+LABEL_SHEETS = {
+    "roll-70x30":  dict(page="roll", cols=1, rows=1, label_w=70, label_h=30),
+    "avery-l7160": dict(page="A4", cols=3, rows=7, label_w=63.5, label_h=38.1, top=15.15, left=7.25, col_gap=2.5),
+    "avery-l7159": dict(page="A4", cols=3, rows=8, label_w=63.5, label_h=33.9, top=12.9, left=7.25, col_gap=2.5),
+    "avery-l7163": dict(page="A4", cols=2, rows=7, label_w=99.1, label_h=38.1, top=15.15, left=4.65, col_gap=2.5),
+    "a4-70x29.7":  dict(page="A4", cols=3, rows=10, label_w=70, label_h=29.7),
+    "avery-5160":  dict(page="Letter", cols=3, rows=10, label_w=66.675, label_h=25.4, top=12.7, left=4.7625, col_gap=3.175),
+    "avery-5163":  dict(page="Letter", cols=2, rows=5, label_w=101.6, label_h=50.8, top=12.7, left=3.96875, col_gap=4.7625),
+}
+PAGE_SIZES = {"A4": A4, "Letter": letter}
+
+def label_sheet(page="A4", cols=1, rows=1, label_w=70, label_h=30, top=0, left=0, col_gap=0, row_gap=0):
+    """
+    A custom label sheet (mm). Raises ValueError if the grid doesn't fit the page.
+    """
+    sheet = dict(page=page, cols=int(cols), rows=int(rows), label_w=label_w, label_h=label_h,
+                 top=top, left=left, col_gap=col_gap, row_gap=row_gap)
+    _sheet_geometry(sheet)
+    return sheet
+
+def _sheet_geometry(sheet):
+    """(pagesize, [(x, y) of each slot in points]); slots run left to right, top to bottom."""
+    if isinstance(sheet, str):
+        if sheet not in LABEL_SHEETS:
+            raise ValueError(f"unknown label sheet {sheet!r}; choose from {', '.join(LABEL_SHEETS)}")
+        sheet = LABEL_SHEETS[sheet]
+    g = {"top": 0, "left": 0, "col_gap": 0, "row_gap": 0, **sheet}
+    w, h = g["label_w"], g["label_h"]
+    if g["cols"] < 1 or g["rows"] < 1 or w <= 0 or h <= 0:
+        raise ValueError("label sheet needs at least one row and column and a positive label size")
+    if g["page"] == "roll":
+        return (w*mm, h*mm), [(0, 0)]
+    if g["page"] not in PAGE_SIZES:
+        raise ValueError(f"unknown page size {g['page']!r}; use roll, {', '.join(PAGE_SIZES)}")
+    page_w, page_h = PAGE_SIZES[g["page"]]
+    right = g["left"] + g["cols"]*w + (g["cols"]-1)*g["col_gap"]
+    bottom = g["top"] + g["rows"]*h + (g["rows"]-1)*g["row_gap"]
+    # a little slack: published templates are rounded to 0.05 mm
+    if right*mm > page_w + 0.5*mm or bottom*mm > page_h + 0.5*mm:
+        raise ValueError(f"{g['cols']}x{g['rows']} labels of {w}x{h} mm don't fit on {g['page']}")
+    slots = [((g["left"] + c*(w + g["col_gap"]))*mm, page_h - (g["top"] + (r+1)*h + r*g["row_gap"])*mm)
+             for r in range(g["rows"]) for c in range(g["cols"])]
+    return (page_w, page_h), slots
+
+def create_label_sheet_pdf(items, sheet="avery-l7160", out_path=None, skip=0, outline=False, progress=None):
+    """
+    Impose labels N-up onto label stock. `items` is an iterable of
+    (part_no, name, count) and may mix part numbers; labels are laid out in
+    that order. `skip` leaves the first slots of the first page empty (for a
+    part-used sheet); `outline` draws the label edges for test prints.
+    Each distinct label is drawn once as a form XObject (see _label_form).
+    """
+    pagesize, slots = _sheet_geometry(sheet)
+    spec = LABEL_SHEETS[sheet] if isinstance(sheet, str) else sheet
+    items = [(str(p), n or "", max(0, int(k))) for p, n, k in items]
+    parts = (tuple(items), sorted(spec.items()), int(skip) % len(slots), bool(outline), LABEL_VERSION)
+    label = items[0][0] if len({p for p, _n, _k in items}) == 1 else f"{len(items)}_parts"
+    return core.pdf_cache().get("labels", parts, lambda path: _render_label_sheet(path, items, spec, pagesize, slots, skip, outline, progress),
+                                label=label, out_path=out_path)
+
+def _render_label_sheet(out_path, items, spec, pagesize, slots, skip, outline, progress):
+    label_w, label_h = spec["label_w"], spec["label_h"]
+    total = sum(k for _p, _n, k in items)
+    c = canvas.Canvas(out_path, pagesize=pagesize)
+    forms = {}
+    slot = int(skip) % len(slots)
+    done = 0
+    for part_no, name, count in items:
+        form = _label_form(c, forms, part_no, name, label_w, label_h)
+        for _ in range(count):
+            if progress and done % 100 == 0: progress(done, total)
+            x, y = slots[slot]
+            c.saveState(); c.translate(x, y); c.doForm(form)
+            if outline: c.setLineWidth(0.25); c.rect(0, 0, label_w*mm, label_h*mm)
+            c.restoreState()
+            done += 1; slot += 1
+            if slot == len(slots):
+                c.showPage(); slot = 0
+    if slot or not done:
+        c.showPage()
+    c.save()
+    return out_path
+
+def create_labels_pdf(part_no, name, qty, out_path=None, label_w_mm=70, label_h_mm=30, progress=None, sheet=None):
+    """`qty` labels for one part: one label per page (roll stock) unless a `sheet` is given."""
+    if sheet is None:
+        sheet = dict(page="roll", cols=1, rows=1, label_w=label_w_mm, label_h=label_h_mm)
+    return create_label_sheet_pdf([(part_no, name, max(1, int(qty)))], sheet, out_path=out_path, progress=progress)
+
+def _labels_pdf_uncached(part_no, name, qty, out_path, label_w_mm=70, label_h_mm=30):
+    # create_labels_pdf without the PDF cache, so benchmarks time the rendering
+    spec = dict(page="roll", cols=1, rows=1, label_w=label_w_mm, label_h=label_h_mm)
+    pagesize, slots = _sheet_geometry(spec)
+    return _render_label_sheet(out_path, [(part_no, name, int(qty))], spec, pagesize, slots, 0, False, None)
+
+def _labels_pdf_per_page(part_no, name, qty, out_path, label_w_mm=70, label_h_mm=30):
+    # the old renderer (barcode encoded and drawn on every page); benchmark baseline only
+    c = canvas.Canvas(out_path, pagesize=(label_w_mm*mm, label_h_mm*mm))
+    for i in range(max(1, int(qty))):
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(5*mm, (label_h_mm-6)*mm, (name or part_no)[:60])
+        barcode = code128.Code128(str(part_no), barHeight=12*mm, barWidth=0.34)
+        barcode.drawOn(c, 5*mm, 6*mm)
+        c.setFont("Helvetica", 9)
+        c.drawString(5*mm, 3*mm, str(part_no))
+        c.showPage()
+    c.save()
+    return out_path
+
+def benchmark_labels(count=10000, part_no="BENCH-0001-XYZ", name="Benchmark label", baseline=True, out_dir=None):
+    """
+    Time create_labels_pdf for `count` labels (and the per-page baseline).
+    Returns {renderer: (seconds, bytes)}; the PDFs are removed afterwards.
+    """
+    import time
+    out_dir = out_dir or core.TMP
+    runs = [("forms", _labels_pdf_uncached)] + ([("per-page", _labels_pdf_per_page)] if baseline else [])
+    results = {}
+    for label, fn in runs:
+        path = os.path.join(out_dir, f"bench_labels_{label}_{os.getpid()}.pdf")
+        t0 = time.perf_counter()
+        fn(part_no, name, count, out_path=path)
+        results[label] = (time.perf_counter() - t0, os.path.getsize(path))
+        os.remove(path)
+    return results
+
+class _StreamingCanvas:
+    """
+    The text-only subset of reportlab's Canvas (setFont, drawString,
+    drawRightString, showPage, save) for long tabular reports. reportlab keeps
+    every page in memory until save(); this writes each page to the file as it
+    is finished, so memory stays flat however many pages the report has.
+    Only the standard (non-embedded) Helvetica fonts are available.
+    """
+    FONTS = {"Helvetica": b"F1", "Helvetica-Bold": b"F2"}
+
+    def __init__(self, path, pagesize=A4):
+        import zlib
+        self._zlib = zlib
+        self.f = open(path, "wb")
+        self.w, self.h = pagesize
+        self.offsets = {}
+        self.pages = []
+        self.ops = []
+        self.font = ("Helvetica", 12)
+        self.next_id = 3 + len(self.FONTS)  # 1 catalog, 2 page tree, then fonts
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _obj(self, num, body):
+        self.offsets[num] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+    def setFont(self, name, size):
+        self.font = (name, size)
+        self.ops.append(b"/%s %.2f Tf" % (self.FONTS[name], size))
+
+    def drawString(self, x, y, text):
+        t = str(text).encode("cp1252", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        self.ops.append(b"BT %.2f %.2f Td (%s) Tj ET" % (x, y, t))
+
+    def drawRightString(self, x, y, text):
+        self.drawString(x - stringWidth(str(text), *self.font), y, text)
+
+    def showPage(self):
+        content = self._zlib.compress(b"\n".join(self.ops))
+        cid, pid = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._obj(cid, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream")
+        self._obj(pid, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Contents %d 0 R >>" % (self.w, self.h, cid))
+        self.pages.append(pid)
+        self.ops = [b"/%s %.2f Tf" % (self.FONTS[self.font[0]], self.font[1])]
+
+    def save(self):
+        if len(self.ops) > 1 or not self.pages:
+            self.showPage()
+        fonts = b" ".join(b"/%s %d 0 R" % (ref, 3 + i) for i, ref in enumerate(self.FONTS.values()))
+        for i, name in enumerate(self.FONTS):
+            self._obj(3 + i, b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % name.encode())
+        kids = b" ".join(b"%d 0 R" % p for p in self.pages)
+        self._obj(2, b"<< /Type /Pages /Kids [%s] /Count %d /Resources << /Font << %s >> >> >>" % (kids, len(self.pages), fonts))
+        self._obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.next_id)
+        for num in range(1, self.next_id):
+            self.f.write(b"%010d 00000 n \n" % self.offsets[num])
+        self.f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.next_id, xref))
+        self.f.close()
+
+    def abort(self):
+        """Close and delete a half-written file (e.g. the job was cancelled)."""
+        self.f.close()
+        os.remove(self.f.name)
+
+REPORT_GROUP_LABELS = {"location_bin": "Location/Bin", "type": "Type"}
+
+def create_inventory_report_pdf(rows=None, out_path=None, title="Inventory Report", progress=None, group_by=(), totals=None):
+    """
+    Inventory report, written page by page as rows arrive. By default rows are
+    streamed from core.iter_inventory_report(group_by) and subtotals come from
+    core.inventory_report_totals(group_by), read from the same snapshot
+    (core.inventory_report). `rows` may be any iterable of
+    (part_no, description, total_qty, *group values) in group order; without
+    `totals`, subtotals are summed as the rows go by.
+    """
+    group_by = tuple(group_by or ())
+    if rows is None:
+        if totals is None:
+            totals, rows = core.inventory_report(group_by)
+        else:
+            rows = core.iter_inventory_report(group_by)
+    if out_path is None:
+        out_path = os.path.join(core.TMP, f"inventory_report_{datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.pdf")
+    c = _StreamingCanvas(out_path, pagesize=A4)
+    w, h = A4; margin = 20*mm
+    col_x = [margin, margin+60*mm]
+    page = 0
+    y = 0
+
+    def new_page():
+        nonlocal page, y
+        if page:
+            c.showPage()
+        page += 1
+        y = h - margin
+        if page == 1:
+            c.setFont("Helvetica-Bold", 16); c.drawString(margin, y, title); y -= 18
+            c.setFont("Helvetica", 10); c.drawString(margin, y, f"Generated: {datetime.datetime.utcnow().isoformat()}Z"); y -= 14
+        c.setFont("Helvetica", 8); c.drawRightString(w - margin, margin / 2, f"Page {page}")
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(col_x[0], y, "Part No"); c.drawString(col_x[1], y, "Description"); c.drawRightString(w - margin, y, "Total Qty")
+        y -= 12
+
+    def line(font, size, left, right="", indent=0, gap=12):
+        nonlocal y
+        if y < margin + 40:
+            new_page()
+        c.setFont(font, size)
+        c.drawString(col_x[0] + indent, y, left)
+        if right != "": c.drawRightString(w - margin, y, right)
+        y -= gap
+
+    def label(level, key):
+        val = key[level]
+        return f"{REPORT_GROUP_LABELS.get(group_by[level], group_by[level])}: {val if val not in (None, '') else '(none)'}"
+
+    running = {}  # prefix -> [items, qty] when totals aren't given
+    def close_groups(key, from_level):
+        for level in range(len(group_by) - 1, from_level - 1, -1):
+            prefix = key[:level + 1]
+            items, qty = totals[prefix] if totals else running.pop(prefix)
+            line("Helvetica-Bold", 9, f"Subtotal {label(level, key)}: {items} items", str(qty), indent=level * 4*mm, gap=16)
+
+    try:
+        new_page()
+        count = totals[()][0] if totals else 0
+        current = None
+        n = 0
+        for n, r in enumerate(rows, 1):
+            if progress and n % 500 == 0: progress(n, count)
+            key = tuple(r[3:3 + len(group_by)])
+            if key != current:
+                level = 0
+                if current is not None:
+                    while key[level] == current[level]:
+                        level += 1
+                    close_groups(current, level)
+                for lv in range(level, len(group_by)):
+                    line("Helvetica-Bold", 10 if lv == 0 else 9.5, label(lv, key), indent=lv * 4*mm, gap=13)
+                current = key
+            if not totals:
+                for k in range(len(group_by) + 1):
+                    acc = running.setdefault(key[:k], [0, 0])
+                    acc[0] += 1; acc[1] += r[2] or 0
+            indent = len(group_by) * 4*mm
+            line("Helvetica", 9, str(r[0] if r[0] is not None else ""), str(r[2] if r[2] is not None else ""), indent=indent, gap=0)
+            c.drawString(col_x[1] + indent, y, (r[1] or "")[:40]); y -= 12
+        if current is not None and group_by:
+            close_groups(current, 0)
+        items, qty = totals[()] if totals else running.get((), (n, 0))
+        line("Helvetica-Bold", 10, f"Total: {items} items", str(qty), gap=14)
+        c.showPage(); c.save()
+    except BaseException:
+        c.abort()
+        raise
+    finally:
+        close = getattr(rows, "close", None)
+        if close: close()  # release the cursor early if we stopped part way
+    return out_path
+
+def create_certified_receipt_pdf(record, out_path=None):
+    return create_form_pdf("certified_receipt", record, out_path, label=record[1])
+
+def create_spares_issue_pdf(record, out_path=None):
+    return create_form_pdf("spares_issue", record, out_path, label=record[1])
+
+def create_demand_supply_pdf(record, out_path=None):
+    return create_form_pdf("demand_supply", record, out_path, label=record[1])
+
+def create_vouchers_pdf(table, records, out_path=None, progress=None):
+    """
+    Many vouchers of one kind as a single document, one page each, ready for
+    one print job. `records` are in core.VOUCHER_COLUMNS[table] order.
+    """
+    if table not in VOUCHER_TEMPLATES:
+        raise ValueError(f"not a voucher form: {table}")
+    def render(path):
+        c = canvas.Canvas(path, pagesize=A4)
+        total = len(records)
+        for i, record in enumerate(records):
+            if progress and i % 20 == 0: progress(i, total)
+            render_form(c, table, record)
+        if not total:
+            c.showPage()
+        c.save()
+    parts = (tuple(_record_stamp(table, r) for r in records), template_version(table))
+    return core.pdf_cache().get(f"{table}_batch", parts, render, label=f"{len(records)}", out_path=out_path)
@@ -0,0 +1,70 @@
+# core_print.py
+"""
+Printing helpers (Windows shell / SumatraPDF). Imported lazily through
+`core.enum_printers`, `core.print_pdf_shell` and `core.print_pdf_sumatra`.
+"""
+
+import os, subprocess
+
+import core
+
+def enum_printers():
+    try:
+        import win32print
+        flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
+        printers = win32print.EnumPrinters(flags)
+        return [p[2] for p in printers]
+    except Exception:
+        return []
+
+def print_pdf_shell(path):
+    try:
+        import win32api
+        win32api.ShellExecute(0, "print", path, None, ".", 0)
+        return True
+    except Exception as e:
+        print("Shell print failed:", e)
+        return False
+
+def print_pdf_sumatra(path, printer_name=None, sumatra_path=None):
+    sumatra_path = sumatra_path or core.SUMATRA_PATH
+    if not os.path.exists(sumatra_path):
+        raise FileNotFoundError("SumatraPDF not found")
+    cmd = [sumatra_path]
+    if printer_name:
+        cmd += ["-print-to", printer_name]
+    else:
+        cmd += ["-print-to-default"]
+    cmd.append(path)
+    subprocess.Popen(cmd, shell=False)
+    return True
+
+def send_raw(data, sink):
+    """
+    Send raw printer bytes (ZPL/EPL) without a driver. `sink` is
+    "tcp://host[:port]" (port 9100 by default), "printer:NAME" for a Windows
+    queue in RAW mode, or a file path (a local file, or a port like LPT1/COM3).
+    Returns the number of bytes sent.
+    """
+    if sink.startswith("tcp://"):
+        import socket
+        host, _, port = sink[len("tcp://"):].rstrip("/").partition(":")
+        with socket.create_connection((host, int(port or 9100)), timeout=10) as s:
+            s.sendall(data)
+    elif sink.startswith("printer:"):
+        import win32print
+        h = win32print.OpenPrinter(sink[len("printer:"):])
+        try:
+            win32print.StartDocPrinter(h, 1, ("INS labels", None, "RAW"))
+            try:
+                win32print.StartPagePrinter(h)
+                win32print.WritePrinter(h, data)
+                win32print.EndPagePrinter(h)
+            finally:
+                win32print.EndDocPrinter(h)
+        finally:
+            win32print.ClosePrinter(h)
+    else:
+        with open(sink, "wb") as f:
+            f.write(data)
+    return len(data)
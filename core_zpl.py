@@ -0,0 +1,65 @@
+# core_zpl.py
+"""
+Raw label streams for thermal printers: ZPL II (Zebra) and EPL2 (older
+Zebra/Eltron), with the same content as core_pdf's labels (name, Code128
+barcode, part number). The printer draws the barcode itself, and each
+distinct label is sent once with a copy count, so a 10,000-label run is a
+few hundred bytes instead of a multi-MB PDF.
+
+Imported lazily through `core.zpl_labels` / `core.epl_labels` /
+`core.create_labels_raw`; send the result with core.send_raw().
+"""
+
+def _dots(mm_, dpi):
+    return int(round(mm_ * dpi / 25.4))
+
+def _zpl_field(text):
+    # ^FH_ hex escapes: _ ^ ~ would otherwise end or corrupt the field
+    return "".join(f"_{ord(ch):02X}" if ch in "_^~" else ch for ch in str(text))
+
+def zpl_labels(items, label_w_mm=70, label_h_mm=30, dpi=203):
+    """ZPL for `items` of (part_no, name, count): one format per label, printed `count` times."""
+    d = lambda v: _dots(v, dpi)
+    module = max(1, round(dpi / 100))  # narrow bar in dots (2 at 203 dpi, 3 at 300)
+    out = []
+    for part_no, name, count in items:
+        count = int(count)
+        if count < 1:
+            continue
+        out.append("\n".join([
+            "^XA", "^CI28", f"^PW{d(label_w_mm)}", f"^LL{d(label_h_mm)}",
+            # name: one line, clipped to the label width
+            f"^FO{d(5)},{d(2.5)}^A0N,{d(4)},{d(4)}^FB{d(label_w_mm - 10)},1,0,L,0^FH_^FD{_zpl_field((name or part_no)[:60])}^FS",
+            f"^FO{d(5)},{d(label_h_mm - 18)}^BY{module}^BCN,{d(12)},N,N,N^FH_^FD{_zpl_field(part_no)}^FS",
+            f"^FO{d(5)},{d(label_h_mm - 5.5)}^A0N,{d(3)},{d(3)}^FH_^FD{_zpl_field(part_no)}^FS",
+            f"^PQ{count}", "^XZ", ""]))
+    return "".join(out).encode("utf-8")
+
+def _epl_field(text):
+    return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def epl_labels(items, label_w_mm=70, label_h_mm=30, dpi=203):
+    """EPL2 for `items` of (part_no, name, count)."""
+    d = lambda v: _dots(v, dpi)
+    module = max(1, round(dpi / 100))
+    out = []
+    for part_no, name, count in items:
+        count = int(count)
+        if count < 1:
+            continue
+        out.append("\n".join([
+            "", "N", f"q{d(label_w_mm)}", f"Q{d(label_h_mm)},24",
+            f"A{d(5)},{d(2.5)},0,4,1,1,N,{_epl_field((name or part_no)[:40])}",
+            f"B{d(5)},{d(label_h_mm - 18)},0,1,{module},{module * 2},{d(12)},N,{_epl_field(part_no)}",
+            f"A{d(5)},{d(label_h_mm - 5.5)},0,2,1,1,N,{_epl_field(part_no)}",
+            f"P{count}", ""]))
+    # EPL is latin-1 on the printer side
+    return "".join(out).encode("latin-1", "replace")
+
+RAW_FORMATS = {"zpl": zpl_labels, "epl": epl_labels}
+
+def create_labels_raw(items, fmt="zpl", label_w_mm=70, label_h_mm=30, dpi=203):
+    """Raw printer bytes for `items` in `fmt` ("zpl" or "epl")."""
+    if fmt not in RAW_FORMATS:
+        raise ValueError(f"unknown label format {fmt!r}; use {', '.join(RAW_FORMATS)}")
+    return RAW_FORMATS[fmt](items, label_w_mm, label_h_mm, dpi)
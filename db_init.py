@@ -1,15 +1,12 @@
 # db_init.py
-import sqlite3
-import os
 from uuid import uuid4
 from datetime import datetime
 
+import core
+
 DB_PATH = r"C:\ProgramData\MyWarehouse\app.db"
 
-def ensure_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    conn.execute("PRAGMA journal_mode=WAL;")
+def _create_schema(conn):
     conn.execute("""
     CREATE TABLE IF NOT EXISTS items(
         id TEXT PRIMARY KEY,
@@ -20,45 +17,28 @@ def ensure_db():
         modified_utc TEXT
     );
     """)
-    conn.commit()
-    conn.close()
+
+def _db():
+    return core.get_db(DB_PATH, setup=_create_schema)
+
+def ensure_db():
+    _db().connection()
 
 def add_item(sku, name, qty):
-    ensure_db()
     if not sku:
         sku = str(uuid4())[:12]  # short unique SKU if not provided
     now = datetime.utcnow().isoformat() + "Z"
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute("INSERT INTO items (id, sku, name, qty, created_utc, modified_utc) VALUES (?,?,?,?,?,?)",
-                (str(uuid4()), sku, name, int(qty), now, now))
-    conn.commit()
-    conn.close()
+    _db().run("INSERT INTO items (id, sku, name, qty, created_utc, modified_utc) VALUES (?,?,?,?,?,?)",
+              (str(uuid4()), sku, name, int(qty), now, now))
     return sku
 
 def get_all_items():
-    ensure_db()
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute("SELECT id, sku, name, qty, created_utc, modified_utc FROM items ORDER BY name")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return _db().run("SELECT id, sku, name, qty, created_utc, modified_utc FROM items ORDER BY name", fetch=True)
 
 def get_item_by_sku(sku):
-    ensure_db()
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute("SELECT id, sku, name, qty FROM items WHERE sku = ?", (sku,))
-    row = cur.fetchone()
-    conn.close()
-    return row
+    rows = _db().run("SELECT id, sku, name, qty FROM items WHERE sku = ?", (sku,), fetch=True)
+    return rows[0] if rows else None
 
 def update_qty(sku, qty):
-    ensure_db()
     now = datetime.utcnow().isoformat() + "Z"
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    cur.execute("UPDATE items SET qty = ?, modified_utc = ? WHERE sku = ?", (int(qty), now, sku))
-    conn.commit()
-    conn.close()
+    _db().run("UPDATE items SET qty = ?, modified_utc = ? WHERE sku = ?", (int(qty), now, sku))
@@ -3,20 +3,19 @@ import sys
 import os
 from PySide6.QtWidgets import (
     QApplication, QWidget, QTabWidget, QFormLayout, QLineEdit, QSpinBox,
-    QTextEdit, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
-    QTableWidgetItem, QMessageBox, QSizePolicy
+    QTextEdit, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QMessageBox, QSizePolicy
 )
-from PySide6.QtCore import Qt
 
 import db_forms
+from table_models import PagedTableModel, make_table_view
 
 APP_TMP = os.path.join(os.environ.get("TEMP", "."), "warehouse_forms")
 
 class FormTab(QWidget):
-    def __init__(self, form_builder, list_loader, headers):
+    def __init__(self, form_builder, table, headers=None):
         super().__init__()
         self.form_builder = form_builder
-        self.list_loader = list_loader
+        self.table_name = table
         self.headers = headers
         self._build_ui()
 
@@ -34,9 +33,8 @@ class FormTab(QWidget):
         btn_row.addStretch()
         layout.addLayout(btn_row)
         # table area
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(self.headers))
-        self.table.setHorizontalHeaderLabels(self.headers)
+        self.model = PagedTableModel(self.table_name, headers=self.headers)
+        self.table = make_table_view(self.model, hide_id=False)
         layout.addWidget(QLabel("Saved records:"))
         layout.addWidget(self.table)
         self.setLayout(layout)
@@ -73,15 +71,8 @@ class FormTab(QWidget):
             child.clear()
 
     def load_records(self):
-        rows = self.list_loader()
-        self.table.setRowCount(len(rows))
-        for rindex, row in enumerate(rows):
-            for cindex, col in enumerate(row):
-                # convert None to empty
-                txt = "" if col is None else str(col)
-                item = QTableWidgetItem(txt)
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(rindex, cindex, item)
+        # first page only; further pages are fetched as the table scrolls
+        self.model.reload()
 
 # Now builders for each form
 def build_inventory_form():
@@ -181,8 +172,6 @@ def attach_inventory_actions(tab: FormTab, form_layout):
             raise ValueError("Provide Item No or Part No")
         db_forms.save_inventory(item_no, part_no, description, denomination, type_, qty, location, received_from, issued_to, balance, remarks)
     tab.save_action = save_action
-    tab.list_loader = db_forms.list_inventory
-    tab.load_records()
 
 def attach_certified_actions(tab: FormTab, form_layout):
     def save_action():
@@ -198,8 +187,6 @@ def attach_certified_actions(tab: FormTab, form_layout):
             raise ValueError("Provide Set No or Part No")
         db_forms.save_certified_receipt(set_no, part_no, item_desc, denom_qty, qty_received, received_from, received_by, remarks)
     tab.save_action = save_action
-    tab.list_loader = db_forms.list_certified_receipt
-    tab.load_records()
 
 def attach_spares_actions(tab: FormTab, form_layout):
     def save_action():
@@ -216,8 +203,6 @@ def attach_spares_actions(tab: FormTab, form_layout):
             raise ValueError("Provide SL No or Part No")
         db_forms.save_spares_issue(sl_no, part_no, description, lf_no, item, qty_issued, balance, issued_to, remarks)
     tab.save_action = save_action
-    tab.list_loader = db_forms.list_spares_issue
-    tab.load_records()
 
 def attach_demand_actions(tab: FormTab, form_layout):
     def save_action():
@@ -234,8 +219,6 @@ def attach_demand_actions(tab: FormTab, form_layout):
             raise ValueError("Provide Pattern No or Description")
         db_forms.save_demand_supply(patt_no, description, mand_dept, lf_no, qty_req, qty_held, balance, location, remarks)
     tab.save_action = save_action
-    tab.list_loader = db_forms.list_demand_supply
-    tab.load_records()
 
 class MainWindow(QWidget):
     def __init__(self):
@@ -248,26 +231,22 @@ class MainWindow(QWidget):
         tabs = QTabWidget()
         # inventory tab
         inv_form_layout = build_inventory_form()
-        inv_tab = FormTab(lambda: inv_form_layout, db_forms.list_inventory,
-                         ["id","item_no","part_no","description","denomination","type","qty","location","received_from","issued_to","balance","remarks","created_utc"])
+        inv_tab = FormTab(lambda: inv_form_layout, "inventory")
         attach_inventory_actions(inv_tab, inv_form_layout)
         tabs.addTab(inv_tab, "Inventory Data Sheet")
         # certified receipt
         cert_form_layout = build_certified_receipt_form()
-        cert_tab = FormTab(lambda: cert_form_layout, db_forms.list_certified_receipt,
-                          ["id","set_no","part_no","item_desc","denom_qty","qty_received","received_from","received_by","remarks","created_utc"])
+        cert_tab = FormTab(lambda: cert_form_layout, "certified_receipt")
         attach_certified_actions(cert_tab, cert_form_layout)
         tabs.addTab(cert_tab, "Certified Receipt Voucher")
         # spares issue
         spares_form_layout = build_spares_issue_form()
-        spares_tab = FormTab(lambda: spares_form_layout, db_forms.list_spares_issue,
-                            ["id","sl_no","part_no","description","lf_no","item","qty_issued","balance","issued_to","remarks","created_utc"])
+        spares_tab = FormTab(lambda: spares_form_layout, "spares_issue")
         attach_spares_actions(spares_tab, spares_form_layout)
         tabs.addTab(spares_tab, "Spares Issue Voucher")
         # demand supply
         demand_form_layout = build_demand_supply_form()
-        demand_tab = FormTab(lambda: demand_form_layout, db_forms.list_demand_supply,
-                             ["id","patt_no","description","mand_dept","lf_no","qty_req","qty_held","balance","location","remarks","created_utc"])
+        demand_tab = FormTab(lambda: demand_form_layout, "demand_supply")
         attach_demand_actions(demand_tab, demand_form_layout)
         tabs.addTab(demand_tab, "Demand on Supply Office")
         layout.addWidget(tabs)
@@ -0,0 +1,217 @@
+# jobs.py
+"""
+Background jobs for the long operations (PDF generation, barcode images,
+backups, printer enumeration) so they don't block the GUI thread.
+
+JobManager runs jobs on its own thread pool and keeps a list of them for the
+JobsPanel. A job is a plain function; if it takes a `progress` keyword it is
+passed a callback `progress(done, total)` (the same convention core uses for
+import_table/create_labels_pdf). Cancellation is cooperative: once a job is
+cancelled, its next progress() call raises JobCancelled, and a job that is
+still queued is simply never started.
+
+Completion callbacks (on_done/on_error) always run on the GUI thread.
+"""
+
+import inspect, time, traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QProgressBar, QHeaderView, QAbstractItemView
+)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# don't flood the GUI thread with progress signals from tight loops
+PROGRESS_INTERVAL = 0.1
+
+class JobCancelled(Exception):
+    pass
+
+class _JobSignals(QObject):
+    progress = Signal(object, int, int)  # job, done, total
+    finished = Signal(object)            # job (status/result/error set)
+
+class Job(QRunnable):
+    def __init__(self, title, fn, args, kwargs, signals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.title = title
+        self.fn = fn; self.args = args; self.kwargs = kwargs
+        self.signals = signals
+        self.status = QUEUED
+        self.done = 0; self.total = 0
+        self.result = None; self.error = None
+        self.on_done = None; self.on_error = None
+        self._cancel = False
+        self._last_emit = 0.0
+        try:
+            self._wants_progress = "progress" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            self._wants_progress = False
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def cancel(self):
+        self._cancel = True
+
+    def progress(self, done, total):
+        if self._cancel:
+            raise JobCancelled()
+        self.done, self.total = done, total
+        now = time.monotonic()
+        if now - self._last_emit >= PROGRESS_INTERVAL:
+            self._last_emit = now
+            self.signals.progress.emit(self, done, total)
+
+    def run(self):
+        if self._cancel:
+            self.status = CANCELLED
+            self.signals.finished.emit(self)
+            return
+        self.status = RUNNING
+        self.signals.progress.emit(self, 0, 0)
+        kwargs = dict(self.kwargs)
+        if self._wants_progress:
+            kwargs["progress"] = self.progress
+        try:
+            self.result = self.fn(*self.args, **kwargs)
+            self.status = DONE
+            if self.total: self.done = self.total
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.status = FAILED
+            traceback.print_exc()
+        self.signals.finished.emit(self)
+
+class JobManager(QObject):
+    """Queue of background jobs. Create on the GUI thread (see job_manager())."""
+    changed = Signal(object)  # job whose status or progress changed
+    added = Signal(object)
+
+    def __init__(self, max_workers=2, parent=None):
+        super().__init__(parent)
+        self.jobs = []
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        # keep the workers (and their SQLite connections) instead of recreating them after 30 s idle
+        self._pool.setExpiryTimeout(-1)
+
+    def submit(self, title, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Queue fn(*args, **kwargs); on_done(result) / on_error(exc) run on the GUI thread."""
+        job = Job(title, fn, args, kwargs, self._signals)
+        job.on_done, job.on_error = on_done, on_error
+        self.jobs.append(job)
+        self.added.emit(job)
+        self._pool.start(job)
+        return job
+
+    def cancel(self, job):
+        if not job.active:
+            return
+        job.cancel()
+        if job.status == QUEUED and self._pool.tryTake(job):
+            job.status = CANCELLED
+            self.changed.emit(job)
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            self.cancel(job)
+
+    def active_jobs(self):
+        return [j for j in self.jobs if j.active]
+
+    def clear_finished(self):
+        self.jobs = [j for j in self.jobs if j.active]
+
+    def wait(self, msecs=-1):
+        """Block until running jobs finish; for shutdown/tests."""
+        return self._pool.waitForDone(msecs)
+
+    def _on_progress(self, job, done, total):
+        self.changed.emit(job)
+
+    def _on_finished(self, job):
+        self.changed.emit(job)
+        if job.status == DONE and job.on_done:
+            job.on_done(job.result)
+        elif job.status == FAILED and job.on_error:
+            job.on_error(job.error)
+
+_manager = None
+
+def job_manager():
+    """The app-wide JobManager (created on first use; needs a QApplication)."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager()
+    return _manager
+
+class JobsPanel(QWidget):
+    """Table of jobs with progress, plus cancel / clear buttons."""
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or job_manager()
+        self._row_of = {}
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Job", "Status", "Progress"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table)
+        btns = QHBoxLayout()
+        self.cancel_btn = QPushButton("Cancel Selected"); self.cancel_all_btn = QPushButton("Cancel All"); self.clear_btn = QPushButton("Clear Finished")
+        btns.addStretch(); btns.addWidget(self.cancel_btn); btns.addWidget(self.cancel_all_btn); btns.addWidget(self.clear_btn)
+        layout.addLayout(btns)
+        self.cancel_btn.clicked.connect(self.on_cancel); self.cancel_all_btn.clicked.connect(self.manager.cancel_all)
+        self.clear_btn.clicked.connect(self.on_clear)
+        self.manager.added.connect(self._add_row); self.manager.changed.connect(self._update_row)
+        for job in self.manager.jobs:
+            self._add_row(job)
+
+    def _add_row(self, job):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(job.title))
+        self.table.setItem(row, 1, QTableWidgetItem(job.status))
+        bar = QProgressBar(); bar.setRange(0, 0 if job.status == RUNNING else 1); bar.setValue(0)
+        self.table.setCellWidget(row, 2, bar)
+        self._row_of[id(job)] = (row, job)
+        self._update_row(job)
+
+    def _update_row(self, job):
+        entry = self._row_of.get(id(job))
+        if entry is None:
+            return
+        row = entry[0]
+        status = job.status if job.status != FAILED else f"failed: {job.error}"
+        self.table.item(row, 1).setText(status)
+        bar = self.table.cellWidget(row, 2)
+        if job.status == RUNNING and not job.total:
+            bar.setRange(0, 0)  # busy indicator until the job reports a total
+        elif job.total:
+            bar.setRange(0, job.total); bar.setValue(job.done)
+        else:
+            bar.setRange(0, 1); bar.setValue(1 if job.status == DONE else 0)
+
+    def on_cancel(self):
+        for idx in self.table.selectionModel().selectedRows():
+            for row, job in self._row_of.values():
+                if row == idx.row():
+                    self.manager.cancel(job)
+
+    def on_clear(self):
+        self.manager.clear_finished()
+        self.table.setRowCount(0); self._row_of = {}
+        for job in self.manager.jobs:
+            self._add_row(job)
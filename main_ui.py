@@ -5,18 +5,23 @@ This file holds all UI code and styling. It imports functionality from core.py.
 Run: python main_ui.py
 """
 
-import sys, os
+import sys, os, time
+_T0 = time.perf_counter()  # cold-start reference point, before Qt and core are imported
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QLineEdit, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView,
+    QLineEdit, QMessageBox,
     QInputDialog, QFileDialog, QSpinBox, QDialog, QFormLayout, QTextEdit,
-    QTabWidget, QGroupBox, QScrollArea, QGridLayout, QDialogButtonBox, QFrame
+    QTabWidget, QGroupBox, QDialogButtonBox, QFrame, QCheckBox, QListView, QDateEdit,
+    QComboBox, QListWidget, QListWidgetItem
 )
 from PySide6.QtGui import QFont, QColor, QPalette, QPixmap
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, QThreadPool, QAbstractListModel, QModelIndex, QSize, QDate
 
 # import functionality from core
 import core
+from table_models import PagedTableModel, SearchController, make_table_view, selected_id, selected_ids
+from jobs import JobsPanel, job_manager
 
 # app stylesheet (modern)
 APP_STYLE = """
@@ -37,10 +42,13 @@ QLineEdit, QTextEdit, QSpinBox { background: #ffffff; border: 1px solid rgba(30,
 QLineEdit:focus, QTextEdit:focus, QSpinBox:focus { border: 1px solid #60a5fa; box-shadow: 0 0 0 4px rgba(96,165,250,0.08); }
 QTabWidget::pane { border: none; background: transparent; }
 QHeaderView::section { background: transparent; padding: 8px; border: none; color: #0f172a; font-weight: 600; }
-QTableWidget::item { padding: 8px; }
-QTableWidget::item:selected { background: rgba(37,99,235,0.12); }
+QTableView::item { padding: 8px; }
+QTableView::item:selected { background: rgba(37,99,235,0.12); }
 """
 
+# burst mode commits queued scans this often (and when it is switched off)
+BURST_COMMIT_MS = 5000
+
 # small helper to create QFormLayout from pairs
 def make_form_widget(fields):
     form = QFormLayout()
@@ -48,26 +56,139 @@ def make_form_widget(fields):
         form.addRow(lab, widget)
     return form
 
-# image preview dialog for barcode images
+# barcode preview: one tile per distinct label with its count. The list view
+# only asks for the visible rows, and each PNG is decoded once, on first paint.
+class BarcodePreviewModel(QAbstractListModel):
+    def __init__(self, previews, width=360, parent=None):
+        super().__init__(parent)
+        self.previews = previews  # [(part_no, name, count, png_bytes)]
+        self.width = width
+        self._pixmaps = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.previews)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        part_no, name, count, png = self.previews[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{part_no}  {name or ''}\nx {count}"
+        if role == Qt.DecorationRole:
+            pm = self._pixmaps.get(index.row())
+            if pm is None:
+                pm = QPixmap(); pm.loadFromData(png, "PNG")
+                pm = self._pixmaps[index.row()] = pm.scaledToWidth(self.width, Qt.SmoothTransformation)
+            return pm
+        return None
+
 class ImagePreviewDialog(QDialog):
-    def __init__(self, image_paths, parent=None):
+    def __init__(self, previews, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Barcode Preview")
         self.resize(760, 540)
         layout = QVBoxLayout(self)
-        scroll = QScrollArea(); scroll.setWidgetResizable(True)
-        container = QWidget(); grid = QGridLayout(container)
-        row = col = 0
-        for idx, p in enumerate(image_paths):
-            lbl = QLabel(); pm = QPixmap(p)
-            lbl.setPixmap(pm.scaledToWidth(360, Qt.SmoothTransformation))
-            grid.addWidget(lbl, row, col, alignment=Qt.AlignCenter)
-            col += 1
-            if col >= 2: col = 0; row += 1
-        scroll.setWidget(container); layout.addWidget(scroll)
+        total = sum(p[2] for p in previews)
+        layout.addWidget(QLabel(f"{total} labels, {len(previews)} distinct"))
+        self.model = BarcodePreviewModel(previews, parent=self)
+        view = QListView(); view.setViewMode(QListView.IconMode); view.setResizeMode(QListView.Adjust)
+        view.setUniformItemSizes(True); view.setIconSize(QSize(360, 160)); view.setSpacing(8)
+        view.setModel(self.model); layout.addWidget(view)
         btns = QDialogButtonBox(QDialogButtonBox.Close)
         btns.rejected.connect(self.reject); layout.addWidget(btns)
 
+class DateRangeDialog(QDialog):
+    """Pick a from/to date (inclusive); defaults to the current month."""
+    def __init__(self, title, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        today = QDate.currentDate()
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1)); self.date_from.setCalendarPopup(True)
+        self.date_to = QDateEdit(today); self.date_to.setCalendarPopup(True)
+        form = QFormLayout(self); form.addRow("From:", self.date_from); form.addRow("To:", self.date_to)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel); form.addRow(btns)
+        btns.accepted.connect(self.accept); btns.rejected.connect(self.reject)
+
+    def range(self):
+        return self.date_from.date().toString(Qt.ISODate), self.date_to.date().toString(Qt.ISODate)
+
+class ExportDialog(QDialog):
+    """Choose what to export: table, columns, an optional created date range and part number."""
+    def __init__(self, table="inventory", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export")
+        self.table = QComboBox(); self.table.addItems(list(core.EXPORT_TABLES)); self.table.setCurrentText(table)
+        self.format = QComboBox(); self.format.addItem("CSV", "csv"); self.format.addItem("Parquet, one file per month", "parquet"); self.format.addItem("Arrow/Feather, one file per month", "feather")
+        self.columns = QListWidget()
+        today = QDate.currentDate()
+        self.use_dates = QCheckBox("Only records created between")
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1)); self.date_from.setCalendarPopup(True); self.date_from.setEnabled(False)
+        self.date_to = QDateEdit(today); self.date_to.setCalendarPopup(True); self.date_to.setEnabled(False)
+        dates = QHBoxLayout(); dates.addWidget(self.use_dates); dates.addWidget(self.date_from); dates.addWidget(QLabel("and")); dates.addWidget(self.date_to)
+        self.part_no = QLineEdit(); self.part_no.setPlaceholderText("all parts (a prefix ending in * matches many)")
+        form = QFormLayout(self); form.addRow("Table:", self.table); form.addRow("Format:", self.format); form.addRow("Columns:", self.columns); form.addRow(dates); form.addRow("Part No:", self.part_no)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel); form.addRow(btns)
+        btns.accepted.connect(self.accept); btns.rejected.connect(self.reject)
+        self.table.currentTextChanged.connect(self._fill_columns); self._fill_columns(table)
+        self.use_dates.toggled.connect(self.date_from.setEnabled); self.use_dates.toggled.connect(self.date_to.setEnabled)
+
+    def _fill_columns(self, table):
+        self.columns.clear()
+        for col in core.TABLE_COLUMNS[table]:
+            item = QListWidgetItem(col); item.setFlags(item.flags() | Qt.ItemIsUserCheckable); item.setCheckState(Qt.Checked); self.columns.addItem(item)
+
+    def options(self):
+        cols = [self.columns.item(i).text() for i in range(self.columns.count()) if self.columns.item(i).checkState() == Qt.Checked]
+        date_from, date_to = (d.date().toString(Qt.ISODate) for d in (self.date_from, self.date_to)) if self.use_dates.isChecked() else (None, None)
+        return dict(table=self.table.currentText(), fmt=self.format.currentData(), columns=cols, date_from=date_from, date_to=date_to, part_no=self.part_no.text().strip() or None)
+
+def export_job(parent, table="inventory"):
+    """Ask what to export and where, then stream it to CSV (or Parquet/Arrow by month) on the job queue."""
+    dlg = ExportDialog(table, parent)
+    if dlg.exec() != QDialog.Accepted: return
+    opts = dlg.options(); fmt = opts.pop("fmt"); name = opts["table"]
+    if not opts["columns"]: QMessageBox.warning(parent, "Export", "Choose at least one column."); return
+    on_error = lambda e: QMessageBox.critical(parent, "Export error", str(e))
+    if fmt == "csv":
+        path, _ = QFileDialog.getSaveFileName(parent, "Save CSV", os.path.expanduser(f"~\\Desktop\\{name}_export.csv"), "CSV files (*.csv)")
+        if not path: return
+        job_manager().submit(f"Export {name}", core.export_csv, path=path, **opts, on_error=on_error,
+                             on_done=lambda n: QMessageBox.information(parent, "Export", f"Exported {n} rows to {path}"))
+        return
+    out_dir = QFileDialog.getExistingDirectory(parent, f"Folder for the {name} export", os.path.expanduser("~\\Desktop"))
+    if not out_dir: return
+    job_manager().submit(f"Export {name} ({fmt})", core.export_columnar, out_dir=out_dir, fmt=fmt, **opts, on_error=on_error,
+                         on_done=lambda counts: QMessageBox.information(parent, "Export", f"Exported {sum(counts.values())} rows in {len(counts)} monthly files to {os.path.join(out_dir, name)}"))
+
+def print_vouchers_job(parent, table, title, ids=None, date_from=None, date_to=None):
+    """Render the chosen vouchers into one PDF on the job queue, then send it as one print job."""
+    def make(progress):
+        records = core.get_vouchers(table, ids=ids, date_from=date_from, date_to=date_to)
+        if not records:
+            return None, 0
+        return core.create_vouchers_pdf(table, records, progress=progress), len(records)
+    def done(result):
+        pdf, n = result
+        if not n: QMessageBox.warning(parent, "Not found", "No records to print."); return
+        QMessageBox.information(parent, "PDF", f"PDF created: {pdf} ({n} voucher{'s' if n != 1 else ''})."); core.print_pdf_shell(pdf)
+    job_manager().submit(title, make, on_done=done, on_error=lambda e: QMessageBox.critical(parent, "PDF error", str(e)))
+
+def load_part_index():
+    # runs on a shared pool thread: don't leave its connection open until the thread expires
+    try: core.part_index().load()
+    finally: core.get_db().release()
+
+class LazyTab(QWidget):
+    """Placeholder that builds the real tab (and so loads its data) the first time it is shown."""
+    def __init__(self, factory):
+        super().__init__(); self._factory = factory; self.widget = None
+        self._layout = QVBoxLayout(self); self._layout.setContentsMargins(0, 0, 0, 0)
+
+    def showEvent(self, event):
+        if self.widget is None:
+            self.widget = self._factory(); self._layout.addWidget(self.widget)
+        super().showEvent(event)
+
 # Tabs implementations — they use core.* functions for data & PDF generation
 class CertifiedTab(QWidget):
     def __init__(self):
@@ -86,13 +207,14 @@ class CertifiedTab(QWidget):
             ("Received By:", self.received_by), ("Remarks:", self.remarks)
         ]))
         btn_row = QHBoxLayout(); self.save_btn = QPushButton("Save"); self.save_btn.setObjectName("primary")
-        self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected")
-        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn)
+        self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected"); self.range_btn = QPushButton("Print Date Range...")
+        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn); btn_row.addWidget(self.range_btn)
         card_layout.addLayout(btn_row)
         layout.addWidget(card)
-        self.table = QTableWidget(); self.table.setColumnCount(5); self.table.setHorizontalHeaderLabels(["id","Set No","Part No","Qty Received","Created"]); self.table.hideColumn(0); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = PagedTableModel("certified_receipt", ["id","set_no","part_no","qty_received","created_utc"], ["id","Set No","Part No","Qty Received","Created"])
+        self.table = make_table_view(self.model, multi=True)
         layout.addWidget(self.table)
-        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print)
+        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print); self.range_btn.clicked.connect(self.on_print_range)
         self.load()
 
     def on_save(self):
@@ -106,20 +228,18 @@ class CertifiedTab(QWidget):
         self.received_from.clear(); self.received_by.clear(); self.remarks.clear()
 
     def load(self):
-        rows = core.list_certified_receipt(); self.table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            self.table.setItem(i,0,QTableWidgetItem(r[0])); self.table.setItem(i,1,QTableWidgetItem(r[1] or ""))
-            self.table.setItem(i,2,QTableWidgetItem(r[2] or "")); self.table.setItem(i,3,QTableWidgetItem(str(r[5] or "")))
-            self.table.setItem(i,4,QTableWidgetItem(r[9] or ""))
-        self.table.resizeRowsToContents()
+        self.model.reload()
 
     def on_print(self):
-        cur = self.table.currentRow()
-        if cur < 0: QMessageBox.warning(self, "Select", "Select a record to print."); return
-        id_ = self.table.item(cur,0).text()
-        rows = core._run("SELECT id,set_no,part_no,item_desc,denom_qty,qty_received,received_from,received_by,remarks,created_utc FROM certified_receipt WHERE id = ?", (id_,), fetch=True)
-        if not rows: QMessageBox.warning(self, "Not found", "Record not found."); return
-        pdf = core.create_certified_receipt_pdf(rows[0]); QMessageBox.information(self, "PDF", f"PDF created: {pdf}."); core.print_pdf_shell(pdf)
+        ids = selected_ids(self.table)
+        if not ids: QMessageBox.warning(self, "Select", "Select one or more records to print."); return
+        print_vouchers_job(self, "certified_receipt", f"Certified receipt x{len(ids)}", ids=ids)
+
+    def on_print_range(self):
+        dlg = DateRangeDialog("Print vouchers by date", self)
+        if dlg.exec() != QDialog.Accepted: return
+        date_from, date_to = dlg.range()
+        print_vouchers_job(self, "certified_receipt", f"Certified receipt {date_from}..{date_to}", date_from=date_from, date_to=date_to)
 
 class SparesIssueTab(QWidget):
     def __init__(self):
@@ -137,12 +257,13 @@ class SparesIssueTab(QWidget):
             ("LF No:", self.lf_no), ("Item:", self.item), ("Qty Issued:", self.qty_issued),
             ("Balance:", self.balance), ("Issued To:", self.issued_to), ("Remarks:", self.remarks)
         ]))
-        btn_row = QHBoxLayout(); self.save_btn = QPushButton("Save"); self.save_btn.setObjectName("primary"); self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected")
-        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn)
+        btn_row = QHBoxLayout(); self.save_btn = QPushButton("Save"); self.save_btn.setObjectName("primary"); self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected"); self.range_btn = QPushButton("Print Date Range...")
+        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn); btn_row.addWidget(self.range_btn)
         card_layout.addLayout(btn_row); layout.addWidget(card)
-        self.table = QTableWidget(); self.table.setColumnCount(5); self.table.setHorizontalHeaderLabels(["id","SL No","Part No","Qty Issued","Created"]); self.table.hideColumn(0); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = PagedTableModel("spares_issue", ["id","sl_no","part_no","qty_issued","created_utc"], ["id","SL No","Part No","Qty Issued","Created"])
+        self.table = make_table_view(self.model, multi=True)
         layout.addWidget(self.table)
-        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print)
+        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print); self.range_btn.clicked.connect(self.on_print_range)
         self.load()
 
     def on_save(self):
@@ -154,20 +275,18 @@ class SparesIssueTab(QWidget):
         self.qty_issued.setValue(0); self.balance.setValue(0); self.issued_to.clear(); self.remarks.clear()
 
     def load(self):
-        rows = core.list_spares_issue(); self.table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            self.table.setItem(i,0,QTableWidgetItem(r[0])); self.table.setItem(i,1,QTableWidgetItem(r[1] or ""))
-            self.table.setItem(i,2,QTableWidgetItem(r[2] or "")); self.table.setItem(i,3,QTableWidgetItem(str(r[6] or "")))
-            self.table.setItem(i,4,QTableWidgetItem(r[10] or ""))
-        self.table.resizeRowsToContents()
+        self.model.reload()
 
     def on_print(self):
-        cur = self.table.currentRow()
-        if cur < 0: QMessageBox.warning(self, "Select", "Select a record to print."); return
-        id_ = self.table.item(cur,0).text()
-        rows = core._run("SELECT id,sl_no,part_no,description,lf_no,item,qty_issued,balance,issued_to,remarks,created_utc FROM spares_issue WHERE id = ?", (id_,), fetch=True)
-        if not rows: QMessageBox.warning(self, "Not found", "Record not found."); return
-        pdf = core.create_spares_issue_pdf(rows[0]); QMessageBox.information(self, "PDF", f"PDF created: {pdf}."); core.print_pdf_shell(pdf)
+        ids = selected_ids(self.table)
+        if not ids: QMessageBox.warning(self, "Select", "Select one or more records to print."); return
+        print_vouchers_job(self, "spares_issue", f"Spares issue x{len(ids)}", ids=ids)
+
+    def on_print_range(self):
+        dlg = DateRangeDialog("Print vouchers by date", self)
+        if dlg.exec() != QDialog.Accepted: return
+        date_from, date_to = dlg.range()
+        print_vouchers_job(self, "spares_issue", f"Spares issue {date_from}..{date_to}", date_from=date_from, date_to=date_to)
 
 class DemandSupplyTab(QWidget):
     def __init__(self):
@@ -185,12 +304,13 @@ class DemandSupplyTab(QWidget):
             ("LF No:", self.lf_no), ("Qty Required:", self.qty_req), ("Qty Held:", self.qty_held),
             ("Balance:", self.balance), ("Location:", self.location), ("Remarks:", self.remarks)
         ]))
-        btn_row = QHBoxLayout(); self.save_btn = QPushButton("Save"); self.save_btn.setObjectName("primary"); self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected")
-        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn)
+        btn_row = QHBoxLayout(); self.save_btn = QPushButton("Save"); self.save_btn.setObjectName("primary"); self.clear_btn = QPushButton("Clear"); self.print_btn = QPushButton("Print Selected"); self.range_btn = QPushButton("Print Date Range...")
+        btn_row.addWidget(self.save_btn); btn_row.addWidget(self.clear_btn); btn_row.addStretch(); btn_row.addWidget(self.print_btn); btn_row.addWidget(self.range_btn)
         card_layout.addLayout(btn_row); layout.addWidget(card)
-        self.table = QTableWidget(); self.table.setColumnCount(5); self.table.setHorizontalHeaderLabels(["id","Pattern No","Description","Qty Req","Created"]); self.table.hideColumn(0); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = PagedTableModel("demand_supply", ["id","patt_no","description","qty_req","created_utc"], ["id","Pattern No","Description","Qty Req","Created"])
+        self.table = make_table_view(self.model, multi=True)
         layout.addWidget(self.table)
-        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print)
+        self.save_btn.clicked.connect(self.on_save); self.clear_btn.clicked.connect(self.on_clear); self.print_btn.clicked.connect(self.on_print); self.range_btn.clicked.connect(self.on_print_range)
         self.load()
 
     def on_save(self):
@@ -201,19 +321,18 @@ class DemandSupplyTab(QWidget):
         self.patt_no.clear(); self.description.clear(); self.mand_dept.clear(); self.lf_no.clear(); self.qty_req.setValue(0); self.qty_held.setValue(0); self.balance.setValue(0); self.location.clear(); self.remarks.clear()
 
     def load(self):
-        rows = core.list_demand_supply(); self.table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            self.table.setItem(i,0,QTableWidgetItem(r[0])); self.table.setItem(i,1,QTableWidgetItem(r[1] or "")); self.table.setItem(i,2,QTableWidgetItem(r[2] or ""))
-            self.table.setItem(i,3,QTableWidgetItem(str(r[5] or ""))); self.table.setItem(i,4,QTableWidgetItem(r[10] or ""))
-        self.table.resizeRowsToContents()
+        self.model.reload()
 
     def on_print(self):
-        cur = self.table.currentRow()
-        if cur < 0: QMessageBox.warning(self, "Select", "Select a record to print."); return
-        id_ = self.table.item(cur,0).text()
-        rows = core._run("SELECT id,patt_no,description,mand_dept,lf_no,qty_req,qty_held,balance,location,remarks,created_utc FROM demand_supply WHERE id = ?", (id_,), fetch=True)
-        if not rows: QMessageBox.warning(self, "Not found", "Record not found."); return
-        pdf = core.create_demand_supply_pdf(rows[0]); QMessageBox.information(self, "PDF", f"PDF created: {pdf}."); core.print_pdf_shell(pdf)
+        ids = selected_ids(self.table)
+        if not ids: QMessageBox.warning(self, "Select", "Select one or more records to print."); return
+        print_vouchers_job(self, "demand_supply", f"Demand on supply x{len(ids)}", ids=ids)
+
+    def on_print_range(self):
+        dlg = DateRangeDialog("Print vouchers by date", self)
+        if dlg.exec() != QDialog.Accepted: return
+        date_from, date_to = dlg.range()
+        print_vouchers_job(self, "demand_supply", f"Demand on supply {date_from}..{date_to}", date_from=date_from, date_to=date_to)
 
 class MainWindow(QWidget):
     def __init__(self):
@@ -221,8 +340,8 @@ class MainWindow(QWidget):
         self.setWindowTitle("INS - Warehouse Inventory")
         self.resize(1280, 860)
         self._build_ui()
-        core.ensure_db_and_migrate()
-        self.refresh_table()
+        # data loads once the event loop is running, i.e. after the window is visible
+        QTimer.singleShot(0, self._after_show)
 
     def _build_ui(self):
         pal = self.palette(); pal.setColor(QPalette.Window, QColor("#f5f7fb")); self.setPalette(pal)
@@ -245,9 +364,18 @@ class MainWindow(QWidget):
         scan_layout = QHBoxLayout(scan_card); self.scan_input = QLineEdit(); self.scan_input.setPlaceholderText("Scan Part No here"); self.scan_input.setMinimumWidth(340)
         self.scan_qty = QSpinBox(); self.scan_qty.setRange(1,100000); self.scan_qty.setValue(1); self.use_btn = QPushButton("Use (decrement)"); self.use_btn.setObjectName("primary")
         scan_layout.addWidget(QLabel("Scanner:")); scan_layout.addWidget(self.scan_input); scan_layout.addWidget(QLabel("Qty:")); scan_layout.addWidget(self.scan_qty); scan_layout.addStretch(); scan_layout.addWidget(self.use_btn)
+        # burst mode: scans are queued with a running tally and committed in one transaction
+        self.burst_chk = QCheckBox("Burst mode"); self.burst_label = QLabel(""); self.burst_commit_btn = QPushButton("Commit burst"); self.burst_commit_btn.setEnabled(False)
+        scan_layout.addWidget(self.burst_chk); scan_layout.addWidget(self.burst_label); scan_layout.addWidget(self.burst_commit_btn)
+        self.burst = None
+        self.burst_timer = QTimer(self); self.burst_timer.setInterval(BURST_COMMIT_MS); self.burst_timer.timeout.connect(self.commit_burst)
         inv_layout.addWidget(scan_card)
 
-        self.table = QTableWidget(); self.table.setColumnCount(7); self.table.setHorizontalHeaderLabels(["id","Part No","Description","Total Qty","Location/Bin","Remarks","Modified"]); self.table.hideColumn(0); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = PagedTableModel("inventory", ["id","part_no","description","total_qty","location_bin","remarks","modified_utc"],
+                                     ["id","Part No","Description","Total Qty","Location/Bin","Remarks","Modified"])
+        self.table = make_table_view(self.model, multi=True)  # multi-select for mixed label runs
+        self.label_sheet = None; self.label_sink = None
+        self.search_ctl = SearchController(self.model, parent=self)
         inv_layout.addWidget(self.table)
 
         bottom_card = QFrame(); bottom_card.setProperty("class","card"); bottom_card.setFrameShape(QFrame.StyledPanel); bottom_layout = QHBoxLayout(bottom_card)
@@ -258,27 +386,41 @@ class MainWindow(QWidget):
         inv_layout.addWidget(bottom_card)
 
         tabs.addTab(inv_tab, "Inventory Data Sheet")
-        tabs.addTab(CertifiedTab(), "Certified Receipt Voucher")
-        tabs.addTab(SparesIssueTab(), "Spares Issue Voucher")
-        tabs.addTab(DemandSupplyTab(), "Demand on Supply Office")
+        tabs.addTab(LazyTab(CertifiedTab), "Certified Receipt Voucher")
+        tabs.addTab(LazyTab(SparesIssueTab), "Spares Issue Voucher")
+        tabs.addTab(LazyTab(DemandSupplyTab), "Demand on Supply Office")
+        self.jobs_panel = JobsPanel(); self.jobs_tab = tabs.addTab(self.jobs_panel, "Jobs"); self.tabs = tabs
+        job_manager().added.connect(self._update_jobs_tab); job_manager().changed.connect(self._update_jobs_tab)
         main.addWidget(tabs); self.setLayout(main)
 
         # signals
         self.add_btn.clicked.connect(self.on_add); self.edit_btn.clicked.connect(self.on_edit); self.del_btn.clicked.connect(self.on_delete)
         self.search.textChanged.connect(self.on_search); self.use_btn.clicked.connect(self.on_use); self.scan_input.returnPressed.connect(self.on_scan_enter)
+        self.burst_chk.toggled.connect(self.on_burst_toggled); self.burst_commit_btn.clicked.connect(self.commit_burst)
         self.generate_labels_btn.clicked.connect(self.on_generate_labels); self.print_sheet_btn.clicked.connect(self.on_print_form)
         self.report_pdf_btn.clicked.connect(self.on_generate_report); self.export_csv_btn.clicked.connect(self.on_export_csv)
         self.tx_report_btn.clicked.connect(self.on_transactions_report); self.backup_btn.clicked.connect(self.on_backup)
 
-    def refresh_table(self, rows=None):
-        if rows is None: rows = core.list_inventory()
-        self.table.setRowCount(len(rows))
-        for i, r in enumerate(rows):
-            # r order: id,s_no,sl_no_contract,set_patt_no,part_no,description,denomination,type,qty_per_gt,mdnd_def,lf_no,location_bin,received_from_whom,qty_received,issued_to_whom,qty_issued,total_qty,balance,remarks,created_utc,modified_utc
-            self.table.setItem(i,0,QTableWidgetItem(r[0])); self.table.setItem(i,1,QTableWidgetItem(r[4] or "")); self.table.setItem(i,2,QTableWidgetItem(r[5] or ""))
-            self.table.setItem(i,3,QTableWidgetItem(str(r[16] or 0))); self.table.setItem(i,4,QTableWidgetItem(r[11] or "")); self.table.setItem(i,5,QTableWidgetItem(r[18] or ""))
-            self.table.setItem(i,6,QTableWidgetItem(r[20] or ""))
-        self.table.resizeRowsToContents()
+    def _after_show(self):
+        self.startup_ms = (time.perf_counter() - _T0) * 1000
+        def first_page():
+            self.model.modelReset.disconnect(first_page)
+            page_ms = (time.perf_counter() - _T0) * 1000
+            # kept with the import profiles (`core.py startup-profile --history`)
+            try: core.record_startup_profile("main_ui (window)", self.startup_ms * 1000, [("first_page", 0, page_ms * 1000)], set(sys.modules))
+            except OSError: pass
+        self.model.modelReset.connect(first_page)
+        self.search_ctl.load_now(self.search.text())
+        # scanner lookups load the index on demand if a scan beats this
+        QThreadPool.globalInstance().start(load_part_index)
+
+    def _update_jobs_tab(self, _job=None):
+        n = len(job_manager().active_jobs())
+        self.tabs.setTabText(self.jobs_tab, f"Jobs ({n})" if n else "Jobs")
+
+    def refresh_table(self):
+        # first page only; the view pulls further pages as the user scrolls
+        self.model.reload()
 
     def on_add(self):
         dlg = QDialog(self); dlg.setWindowTitle("Add Item"); dlg.setMinimumWidth(720)
@@ -313,10 +455,7 @@ class MainWindow(QWidget):
             QMessageBox.information(self, "Saved", "Item added."); self.refresh_table()
 
     def _selected_id(self):
-        cur = self.table.currentRow()
-        if cur < 0: return None
-        item = self.table.item(cur, 0)
-        return item.text() if item else None
+        return selected_id(self.table)
 
     def on_edit(self):
         id_ = self._selected_id()
@@ -343,11 +482,11 @@ class MainWindow(QWidget):
         btns = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel); form.addRow(btns)
         btns.accepted.connect(dlg.accept); btns.rejected.connect(dlg.reject)
         if dlg.exec() == QDialog.Accepted:
-            core.update_inventory(id_, s_no.text().strip(), sl_no_contract.text().strip(), set_patt_no.text().strip(), part_no.text().strip(),
+            updated = core.update_inventory(id_, s_no.text().strip(), sl_no_contract.text().strip(), set_patt_no.text().strip(), part_no.text().strip(),
                              description.text().strip(), denomination.text().strip(), type_.text().strip(), qty_per_gt.value(),
                              mdnd_def.text().strip(), lf_no.text().strip(), location_bin.text().strip(), received_from_whom.text().strip(),
                              qty_received.value(), issued_to_whom.text().strip(), qty_issued.value(), total_qty.value(), balance.value(), remarks.toPlainText().strip())
-            QMessageBox.information(self, "Updated", "Record updated."); self.refresh_table()
+            QMessageBox.information(self, "Updated", "Record updated."); self.model.update_rows([updated])
 
     def on_delete(self):
         id_ = self._selected_id()
@@ -356,47 +495,127 @@ class MainWindow(QWidget):
         core.delete_inventory(id_); QMessageBox.information(self, "Deleted", "Record deleted."); self.refresh_table()
 
     def on_search(self, text):
-        if not text: self.refresh_table(); return
-        rows = core.search_inventory(text); self.refresh_table(rows)
+        # debounced and run off the GUI thread; filtering is an FTS match in SQL
+        self.search_ctl.set_text(text)
 
     def on_use(self):
         part_no = self.scan_input.text().strip(); qty = self.scan_qty.value()
         if not part_no: QMessageBox.warning(self, "Scanner", "Scan or enter Part No first."); return
-        rec = core.get_inventory_by_partno(part_no)
+        rec = core.part_index().lookup(part_no)  # in-memory; no DB round-trip
         if not rec: QMessageBox.warning(self, "Not found", f"Part No {part_no} not in inventory."); self.scan_input.clear(); return
-        core.adjust_qty_by_partno(part_no, -qty, reason="usage (manual)", source="scanner")
-        QMessageBox.information(self, "Updated", f"Decremented {qty} from {part_no}."); self.scan_input.clear(); self.refresh_table()
+        updated = core.adjust_qty_by_partno(part_no, -qty, reason="usage (manual)", source="scanner")
+        QMessageBox.information(self, "Updated", f"Decremented {qty} from {part_no}."); self.scan_input.clear(); self.model.update_rows(updated)
 
     def on_scan_enter(self):
         part_no = self.scan_input.text().strip()
         if not part_no: return
+        if self.burst is not None: self._burst_scan(part_no); return
         qty = self.scan_qty.value()
-        rec = core.get_inventory_by_partno(part_no)
+        rec = core.part_index().lookup(part_no)  # (id, description, balance, location_bin)
         if not rec: QMessageBox.warning(self, "Not found", f"Part No {part_no} not in inventory."); self.scan_input.clear(); return
-        resp = QMessageBox.question(self, "Confirm Usage", f"Use {qty} of Part No {part_no} ({rec[5]})?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        resp = QMessageBox.question(self, "Confirm Usage", f"Use {qty} of Part No {part_no} ({rec[1]})?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if resp != QMessageBox.StandardButton.Yes: self.scan_input.clear(); return
-        core.adjust_qty_by_partno(part_no, -qty, reason="usage (scanner)", source="scanner"); QMessageBox.information(self, "Updated", f"{qty} units deducted from {part_no}."); self.scan_input.clear(); self.refresh_table()
+        updated = core.adjust_qty_by_partno(part_no, -qty, reason="usage (scanner)", source="scanner"); QMessageBox.information(self, "Updated", f"{qty} units deducted from {part_no}."); self.scan_input.clear(); self.model.update_rows(updated)
+
+    # --- burst mode -----------------------------------------------------------
+    def on_burst_toggled(self, on):
+        if on:
+            self.burst = core.ScanBuffer(); self.burst_timer.start(); self.burst_commit_btn.setEnabled(True)
+            self._burst_status("Burst mode on: scans are queued and committed every few seconds.")
+        else:
+            self.burst_timer.stop()
+            if self.commit_burst(): self.burst = None; self.burst_label.setText("")
+            else: self.burst_chk.blockSignals(True); self.burst_chk.setChecked(True); self.burst_chk.blockSignals(False); self.burst_timer.start(); return
+            self.burst_commit_btn.setEnabled(False)
+        self.scan_input.setFocus()
+
+    def _burst_scan(self, part_no):
+        qty = self.scan_qty.value(); self.scan_input.clear()
+        desc = self.burst.add(part_no, qty)
+        if desc is None:
+            QApplication.beep(); self._burst_status(f"UNKNOWN part {part_no} (not queued)", error=True); return
+        self._burst_status(f"{part_no} ({desc}) x{qty}")
+
+    def _burst_status(self, last, error=False):
+        b = self.burst
+        tally = f"{len(b)} scans / {len(b.tally)} parts pending" if b else ""
+        self.burst_label.setStyleSheet("color: #b91c1c; font-weight: 600;" if error else "")
+        self.burst_label.setText(f"{tally}  |  {last}" if tally else last)
+
+    def commit_burst(self):
+        """Commit the queued scans; returns False (and keeps the queue) if the commit failed."""
+        if self.burst is None or not len(self.burst): return True
+        n = len(self.burst)
+        try: updated = self.burst.flush()
+        except Exception as e: self._burst_status(f"commit failed, {n} scans kept: {e}", error=True); return False
+        self.model.update_rows(updated); self._burst_status(f"committed {n} scans")
+        return True
+
+    def closeEvent(self, event):
+        if not self.commit_burst():
+            QMessageBox.critical(self, "Burst mode", "Queued scans could not be committed; close again to discard them.")
+            self.burst = None; event.ignore(); return
+        active = job_manager().active_jobs()
+        if active:
+            if QMessageBox.question(self, "Jobs running", f"{len(active)} background job(s) still running. Cancel them and quit?") != QMessageBox.StandardButton.Yes:
+                event.ignore(); return
+            job_manager().cancel_all(); job_manager().wait()
+        super().closeEvent(event)
 
     def on_generate_labels(self):
-        id_ = self._selected_id()
-        if not id_: QMessageBox.warning(self, "Select", "Select an item first."); return
-        rec = core.get_inventory_by_id(id_)
-        if not rec: QMessageBox.warning(self, "Error", "Record not found."); return
-        part_no = rec[4]; name = rec[5]; qty_default = rec[16] or 1
-        count, ok = QInputDialog.getInt(self, "Labels count", "Number of labels to generate (per product):", value=qty_default, min=1, max=10000)
+        ids = selected_ids(self.table)
+        if not ids: QMessageBox.warning(self, "Select", "Select one or more items first."); return
+        recs = [r for r in (core.get_inventory_by_id(i) for i in ids) if r]
+        if not recs: QMessageBox.warning(self, "Error", "Record not found."); return
+        if len(recs) == 1:
+            count, ok = QInputDialog.getInt(self, "Labels count", "Number of labels to generate (per product):", value=recs[0][16] or 1, min=1, max=10000)
+        else:
+            count, ok = QInputDialog.getInt(self, "Labels count", f"Labels per item for {len(recs)} items (0 = each item's Total Qty):", value=0, min=0, max=10000)
+        if not ok: return
+        raw = {"ZPL to label printer": "zpl", "EPL to label printer": "epl"}
+        sheets = list(core.LABEL_SHEETS) + list(raw)
+        current = sheets.index(self.label_sheet) if self.label_sheet in sheets else 0
+        sheet, ok = QInputDialog.getItem(self, "Label stock", "Print on:", sheets, current, False)
         if not ok: return
-        image_paths = core.generate_barcode_images(part_no, name, count)
-        dlg = ImagePreviewDialog(image_paths, parent=self); dlg.exec()
-        pdf = core.create_labels_pdf(part_no, name, count)
-        QMessageBox.information(self, "Labels", f"Labels PDF created: {pdf}. You can print it now with a label printer.")
+        self.label_sheet = sheet
+        items = [(r[4], r[5], count or r[16] or 1) for r in recs]
+        total = sum(k for _p, _n, k in items)
+        title = f"Labels {items[0][0]} x{total}" if len(items) == 1 else f"Labels {len(items)} items x{total}"
+        on_error = lambda e: QMessageBox.critical(self, "Labels error", str(e))
+        if sheet in raw:
+            # thermal printers draw the barcode themselves: a few hundred bytes instead of a PDF
+            sink, ok = QInputDialog.getText(self, "Label printer", "Send to (tcp://host:9100, printer:NAME, or a file/port):",
+                                            text=self.label_sink or core.LABEL_PRINTER)
+            if not ok or not sink.strip(): return
+            self.label_sink = sink = sink.strip()
+            fmt = raw[sheet]
+            job_manager().submit(title, lambda: core.send_raw(core.create_labels_raw(items, fmt), sink),
+                                 on_done=lambda n: QMessageBox.information(self, "Labels", f"Sent {total} labels ({n} bytes of {fmt.upper()}) to {sink}."),
+                                 on_error=on_error)
+            return
+        def make(progress):
+            # previews are one in-memory render per distinct barcode; the PDF is the long part
+            previews = core.barcode_previews(items)
+            return previews, core.create_label_sheet_pdf(items, sheet, progress=progress)
+        def done(result):
+            previews, pdf = result
+            ImagePreviewDialog(previews, parent=self).exec()
+            QMessageBox.information(self, "Labels", f"Labels PDF created: {pdf} ({total} labels on {sheet}). You can print it now.")
+        job_manager().submit(title, make, on_done=done, on_error=on_error)
 
     def on_print_form(self):
         id_ = self._selected_id()
         if not id_: QMessageBox.warning(self, "Select", "Select a record to print form."); return
         rec = core.get_inventory_by_id(id_)
         if not rec: QMessageBox.warning(self, "Error", "Record not found."); return
-        pdf = core.create_inventory_sheet_pdf(rec)
-        printers = core.enum_printers()
+        def make():
+            # enumerating network printers can be as slow as rendering
+            return core.create_inventory_sheet_pdf(rec), core.enum_printers()
+        job_manager().submit(f"Data sheet {rec[4] or ''}".strip(), make, on_done=self._print_form_ready,
+                             on_error=lambda e: QMessageBox.critical(self, "Print error", str(e)))
+
+    def _print_form_ready(self, result):
+        pdf, printers = result
         if printers:
             printer, ok = QInputDialog.getItem(self, "Select Printer", "Printer:", printers, 0, False)
             if ok and printer:
@@ -411,29 +630,28 @@ class MainWindow(QWidget):
             QMessageBox.information(self, "Print", "Used default system print command (no printer list).")
 
     def on_generate_report(self):
-        rows = core.list_inventory(); pdf = core.create_inventory_report_pdf(rows); QMessageBox.information(self, "Report", f"Inventory report created: {pdf}"); core.print_pdf_shell(pdf)
+        groupings = {"No grouping": (), "Location/Bin": ("location_bin",), "Location/Bin, then Type": ("location_bin", "type"), "Type": ("type",)}
+        choice, ok = QInputDialog.getItem(self, "Inventory report", "Group by:", list(groupings), 0, False)
+        if not ok: return
+        group_by = groupings[choice]
+        def make(progress):
+            # streamed from a cursor, with subtotals from SQL
+            return core.create_inventory_report_pdf(group_by=group_by, progress=progress)
+        def done(pdf):
+            QMessageBox.information(self, "Report", f"Inventory report created: {pdf}"); core.print_pdf_shell(pdf)
+        job_manager().submit("Inventory report", make, on_done=done,
+                             on_error=lambda e: QMessageBox.critical(self, "Report error", str(e)))
 
     def on_export_csv(self):
-        rows = core.list_inventory(); path, _ = QFileDialog.getSaveFileName(self, "Save CSV", os.path.expanduser("~\\Desktop\\inventory_export.csv"), "CSV files (*.csv)")
-        if not path: return
-        import csv
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f); writer.writerow(["id","s_no","sl_no_contract","set_patt_no","part_no","description","denomination","type","qty_per_gt","mdnd_def","lf_no","location_bin","received_from_whom","qty_received","issued_to_whom","qty_issued","total_qty","balance","remarks","created_utc","modified_utc"])
-            for r in rows: writer.writerow(list(r))
-        QMessageBox.information(self, "Export", f"Exported CSV to {path}")
+        export_job(self, "inventory")
 
     def on_transactions_report(self):
-        rows = core.list_transactions(limit=1000); path, _ = QFileDialog.getSaveFileName(self, "Save Transactions CSV", os.path.expanduser("~\\Desktop\\transactions.csv"), "CSV files (*.csv)")
-        if not path: return
-        import csv
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f); writer.writerow(["id","part_no","delta","tx_type","reason","source","created_utc"])
-            for r in rows: writer.writerow(list(r))
-        QMessageBox.information(self, "Saved", f"Transactions exported to {path}")
+        export_job(self, "transactions")
 
     def on_backup(self):
-        try: core.backup_db(); QMessageBox.information(self, "Backup", f"Backup created in {core.BACKUP_DIR}")
-        except Exception as e: QMessageBox.critical(self, "Backup error", str(e))
+        job_manager().submit("Backup", core.backup_db,
+                             on_done=lambda _: QMessageBox.information(self, "Backup", f"Backup created in {core.BACKUP_DIR}"),
+                             on_error=lambda e: QMessageBox.critical(self, "Backup error", str(e)))
 
 # ---------------------------
 # Run
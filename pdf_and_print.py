@@ -38,13 +38,17 @@ def create_labels_pdf(sku, name, qty, out_path=None, label_w_mm=70, label_h_mm=3
     if out_path is None:
         out_path = os.path.join(TMP, f"labels_{sku}_{datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.pdf")
     c = canvas.Canvas(out_path, pagesize=(label_w_mm*mm, label_h_mm*mm))
+    # every label is the same: draw it once as a form XObject and reference it per page
+    c.beginForm("label", 0, 0, label_w_mm*mm, label_h_mm*mm)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(5*mm, (label_h_mm-6)*mm, name[:60])
+    barcode = code128.Code128(sku, barHeight=12*mm, barWidth=0.34)
+    barcode.drawOn(c, 5*mm, 6*mm)
+    c.setFont("Helvetica", 9)
+    c.drawString(5*mm, 3*mm, sku)
+    c.endForm()
     for i in range(max(1,int(qty))):
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(5*mm, (label_h_mm-6)*mm, name[:60])
-        barcode = code128.Code128(sku, barHeight=12*mm, barWidth=0.34)
-        barcode.drawOn(c, 5*mm, 6*mm)
-        c.setFont("Helvetica", 9)
-        c.drawString(5*mm, 3*mm, sku)
+        c.doForm("label")
         c.showPage()
     c.save()
     return out_path
@@ -81,50 +85,19 @@ def create_inventory_report_pdf(rows, out_path=None, title="Inventory Report"):
 # ---------------------------
 # New: PDF builders for other forms
 # ---------------------------
+# The voucher layouts live in core_pdf.FORM_TEMPLATES; these keep the old
+# names. Without out_path the PDF stays at its path in the PDF cache.
 def create_certified_receipt_pdf(record, out_path=None):
-    # record: (id,set_no,part_no,item_desc,denom_qty,qty_received,received_from,received_by,remarks,created_utc)
-    if out_path is None:
-        out_path = os.path.join(TMP, f"certified_receipt_{record[1] or 'rec'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, h - margin, "Certified Receipt Voucher")
-    y = h - margin - 30
-    labels = ["Set No:", "Part No:", "Item Description:", "Denomination/Qty:", "Qty Received:", "Received From:", "Received By:", "Remarks:"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", str(record[5] or ""), record[6] or "", record[7] or "", record[8] or ""]
-    c.setFont("Helvetica", 11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, lab); c.drawString(margin+120, y, val); y -= 16
-    c.showPage(); c.save(); return out_path
+    from core_pdf import create_form_pdf
+    return create_form_pdf("certified_receipt", record, out_path, label=record[1])
 
 def create_spares_issue_pdf(record, out_path=None):
-    # record: (id,sl_no,part_no,description,lf_no,item,qty_issued,balance,issued_to,remarks,created_utc)
-    if out_path is None:
-        out_path = os.path.join(TMP, f"spares_issue_{record[1] or 'si'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, h - margin, "Spares Issue Voucher")
-    y = h - margin - 30
-    labels = ["SL No:", "Part No:", "Description:", "LF No:", "Item:", "Qty Issued:", "Balance:", "Issued To:", "Remarks:"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", record[5] or "", str(record[6] or ""), str(record[7] or ""), record[8] or "", record[9] or ""]
-    c.setFont("Helvetica", 11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, lab); c.drawString(margin+120, y, val); y -= 16
-    c.showPage(); c.save(); return out_path
+    from core_pdf import create_form_pdf
+    return create_form_pdf("spares_issue", record, out_path, label=record[1])
 
 def create_demand_supply_pdf(record, out_path=None):
-    # record: (id,patt_no,description,mand_dept,lf_no,qty_req,qty_held,balance,location,remarks,created_utc)
-    if out_path is None:
-        out_path = os.path.join(TMP, f"demand_supply_{record[1] or 'ds'}.pdf")
-    c = canvas.Canvas(out_path, pagesize=A4)
-    w, h = A4; margin = 20*mm
-    c.setFont("Helvetica-Bold", 16); c.drawString(margin, h - margin, "Demand on the Supply Office for Naval Stores")
-    y = h - margin - 30
-    labels = ["Pattern No:", "Description:", "Mand/Dept:", "LF No:", "Qty Required:", "Qty Held:", "Balance:", "Location:", "Remarks:"]
-    vals = [record[1] or "", record[2] or "", record[3] or "", record[4] or "", str(record[5] or ""), str(record[6] or ""), str(record[7] or ""), record[8] or "", record[9] or ""]
-    c.setFont("Helvetica", 11)
-    for lab, val in zip(labels, vals):
-        c.drawString(margin, y, lab); c.drawString(margin+160, y, val); y -= 16
-    c.showPage(); c.save(); return out_path
+    from core_pdf import create_form_pdf
+    return create_form_pdf("demand_supply", record, out_path, label=record[1])
 
 # ---------------------------
 # Barcode image generation (preview)
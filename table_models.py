@@ -0,0 +1,260 @@
+# table_models.py
+"""
+Lazy, SQL-backed table models for the Qt grids.
+
+PagedTableModel pulls rows from core.list_page() one keyset page at a time
+(canFetchMore/fetchMore), so a view only ever holds the pages the user has
+scrolled through, and QTableView only paints the visible rows. Sorting and
+searching are pushed down into SQL and reset the model to its first page.
+
+SearchController runs the first page of a search off the GUI thread.
+"""
+
+import sqlite3
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, Signal
+from PySide6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+import core
+
+class PagedTableModel(QAbstractTableModel):
+    def __init__(self, table, columns=None, headers=None, page_size=500, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.columns = list(columns or core.TABLE_COLUMNS[table])
+        if "id" not in self.columns:
+            raise ValueError("PagedTableModel needs the id column")
+        self.headers = list(headers or self.columns)
+        self.page_size = page_size
+        self.order_by = None  # None: newest first, or best match first while searching
+        self.descending = True
+        self.search = None
+        self._rows = []
+        self._token = None
+        self._loaded = False
+        self._id_col = self.columns.index("id")
+        self._row_of = {}  # id -> row number, for in-place updates
+        # positions of this model's columns within a full TABLE_COLUMNS row
+        self._full_pos = [core.TABLE_COLUMNS[table].index(c) for c in self.columns]
+
+    # --- data access -------------------------------------------------------
+    def ordering(self, search):
+        """(order_by, descending) for list_page: a header sort if one is chosen, else the default."""
+        if self.order_by is not None:
+            return self.order_by, self.descending
+        return ("rank" if search else "created_utc"), True
+
+    def fetch_page(self, after=None):
+        order_by, descending = self.ordering(self.search)
+        return core.list_page(self.table, after=after, limit=self.page_size, columns=self.columns,
+                              order_by=order_by, descending=descending, search=self.search)
+
+    def reload(self):
+        rows, token = self.fetch_page()
+        self.set_first_page(rows, token)
+
+    def set_first_page(self, rows, token):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._token = token
+        self._loaded = True
+        self._row_of = {r[self._id_col]: i for i, r in enumerate(self._rows)}
+        self.endResetModel()
+
+    def set_search(self, term):
+        self.search = term or None
+        self.reload()
+
+    def update_rows(self, full_rows):
+        """
+        Patch loaded rows in place from full table rows (as returned by
+        core.update_inventory / adjust_qty_by_partno). Rows not loaded are
+        ignored; position is kept even if the sort key changed.
+        """
+        for full in full_rows or ():
+            if full is None:
+                continue
+            row = self._row_of.get(full[0])  # id is first in every table
+            if row is None:
+                continue
+            self._rows[row] = tuple(full[p] for p in self._full_pos)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def row_id(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row][self._id_col]
+        return None
+
+    def record(self, row):
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    # --- Qt model interface -------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        val = self._rows[index.row()][index.column()]
+        return "" if val is None else str(val)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._token is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._token is None:
+            return
+        rows, token = self.fetch_page(self._token)
+        self._token = token
+        if rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._rows.extend(rows)
+            for i, r in enumerate(rows, start):
+                self._row_of[r[self._id_col]] = i
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            # "unsorted" from the header means the default order (see ordering())
+            self.order_by, self.descending = None, True
+        else:
+            self.order_by = self.columns[column]
+            self.descending = order == Qt.DescendingOrder
+        if self._loaded:
+            self.reload()
+
+def make_table_view(model, hide_id=True, multi=False):
+    """QTableView set up the way the app's grids look, bound to `model`."""
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setSelectionMode(QAbstractItemView.ExtendedSelection if multi else QAbstractItemView.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    # fixed row height: no per-row measuring, which is what made large tables slow
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().hide()
+    # no indicator until the user clicks a header: rows start newest first
+    view.horizontalHeader().setSortIndicator(-1, Qt.DescendingOrder)
+    view.setSortingEnabled(True)
+    if hide_id:
+        view.hideColumn(model.columns.index("id"))
+    return view
+
+def selected_id(view):
+    idx = view.currentIndex()
+    if not idx.isValid():
+        return None
+    return view.model().row_id(idx.row())
+
+def selected_ids(view):
+    """ids of all selected rows, in row order (current row only if nothing is selected)."""
+    rows = sorted(i.row() for i in view.selectionModel().selectedRows())
+    if not rows:
+        cur = selected_id(view)
+        return [cur] if cur else []
+    model = view.model()
+    return [i for i in (model.row_id(r) for r in rows) if i]
+
+class _PageSignals(QObject):
+    # generation, rows, next_token, search term
+    done = Signal(int, object, object, object)
+
+class _PageJob(QRunnable):
+    def __init__(self, generation, model, term, signals):
+        super().__init__()
+        self.generation = generation
+        self.signals = signals
+        self.term = term
+        # snapshot what the query needs; the model itself is only touched on the GUI thread
+        order_by, descending = model.ordering(term)
+        self.args = dict(table=model.table, limit=model.page_size, columns=list(model.columns),
+                         order_by=order_by, descending=descending)
+        self.cancelled = False
+        self.conn = None
+
+    def cancel(self):
+        self.cancelled = True
+        conn = self.conn
+        if conn is not None:
+            conn.interrupt()  # aborts the running statement, if any
+
+    def run(self):
+        if self.cancelled:
+            return
+        self.conn = core.get_db().connection()
+        try:
+            rows, token = core.list_page(search=self.term, **self.args)
+        except sqlite3.OperationalError:
+            if self.cancelled:
+                return
+            raise
+        finally:
+            self.conn = None
+        if not self.cancelled:
+            self.signals.done.emit(self.generation, rows, token, self.term)
+
+class SearchController(QObject):
+    """
+    Debounces search text and loads the first result page on a worker thread.
+    A newer query cancels the one in flight and results from superseded
+    queries are dropped, so the grid only ever shows the latest search.
+    """
+
+    def __init__(self, model, delay_ms=250, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._term = ""
+        self._generation = 0
+        self._job = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+        self._signals = _PageSignals(self)
+        self._signals.done.connect(self._apply)
+        # one long-lived thread: it keeps its SQLite connection, and searches never overlap
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setExpiryTimeout(-1)
+
+    def set_text(self, text):
+        self._term = text.strip()
+        self._timer.start()
+
+    def load_now(self, text=""):
+        """Start loading the first page for `text` immediately, without the debounce."""
+        self._term = text.strip()
+        self._timer.stop()
+        self._start()
+
+    def _start(self):
+        self._generation += 1
+        if self._job is not None:
+            self._job.cancel()
+        self._job = _PageJob(self._generation, self.model, self._term or None, self._signals)
+        self._job.setAutoDelete(False)
+        self._pool.start(self._job)
+
+    def _apply(self, generation, rows, token, term):
+        if generation != self._generation:
+            return  # superseded while running
+        self._job = None
+        self.model.search = term
+        self.model.set_first_page(rows, token)
+
+    def wait(self):
+        """Block until the pending search (if any) has been applied; for tests/shutdown."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._start()
+        self._pool.waitForDone()